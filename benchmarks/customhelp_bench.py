@@ -0,0 +1,368 @@
+"""Offline latency and allocation benchmarks for CustomHelp and its themes
+
+No Discord connection is needed, a synthetic bot with N cogs x M commands (groups nested
+down to a given depth, each command carrying a configurable amount of checks) is built
+and every theme renders the main page, a category, a cog and a command against it.
+
+Needs Red-DiscordBot and the cog requirements installed, run from the repo root:
+
+    python benchmarks/customhelp_bench.py --cogs 40 --commands 15 --depth 2 --checks 2
+
+Rendering goes through BaguetteHelp.render, the same path send_help takes, with the render
+cache emptied before every run unless --warm is passed. Timings are wall clock per render
+(including building the first page, which is what gets sent), allocations are the
+tracemalloc peak of a single render.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from types import MethodType, SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+from discord.ext.commands.view import StringView  # noqa: E402
+from redbot.core import commands  # noqa: E402
+from redbot.core.commands.help import HelpSettings  # noqa: E402
+
+from customhelp import themes  # noqa: E402
+from customhelp.core import GLOBAL_CATEGORIES  # noqa: E402
+from customhelp.core.base_help import THEME_FEATURES, BaguetteHelp  # noqa: E402
+from customhelp.core.category import Category  # noqa: E402
+from customhelp.core.utils import clear_command_metadata  # noqa: E402
+
+FORMATTER_SETTINGS = {
+    "nav": True,
+    "set_formatter": True,
+    "thumbnail": None,
+    "timeout": 120,
+    "replies": True,
+    "menutype": "buttons",
+    "arrowtype": "buttons",
+    "deletemessage": False,
+    "persistent": False,
+}
+DOCSTRING = (
+    "Does a synthetic thing for the benchmark.\n\n"
+    "This is the long help of the command, it's here so that shortdocs and\n"
+    "the command help pages have something realistic to chew on."
+)
+
+
+class BenchChannel:
+    """Stands in for a DM channel, so no guild permission rules are involved"""
+
+    def __init__(self):
+        self.id = 2
+        self.type = discord.ChannelType.private
+
+    def permissions_for(self, member):
+        return discord.Permissions.text()
+
+
+class BenchContext(commands.Context):
+    @property
+    def me(self):
+        return self.bot.user
+
+    @property
+    def clean_prefix(self):
+        return self.prefix
+
+    async def embed_requested(self):
+        return self.bot.embeds
+
+    async def embed_color(self):
+        return discord.Color.red()
+
+    async def send(self, *args, **kwargs):
+        return None
+
+
+class BenchBot:
+    """The bits of Red the help formatter touches"""
+
+    def __init__(self, owner: bool, embeds: bool):
+        self.user = SimpleNamespace(
+            id=1,
+            display_name="Bench",
+            display_avatar=SimpleNamespace(url="https://cdn.discordapp.com/embed/avatars/0.png"),
+        )
+        self.author = SimpleNamespace(id=3, display_name="Invoker", roles=())
+        self.owner_ids = {self.author.id} if owner else {4}
+        self.description = "A synthetic bot for benchmarking help"
+        self.embeds = embeds
+        self.cogs: Dict[str, commands.Cog] = {}
+        self.all_commands: Dict[str, commands.Command] = {}
+        self._help_formatter: Optional[BaguetteHelp] = None
+
+    @property
+    def commands(self):
+        return set(self.all_commands.values())
+
+    def walk_commands(self):
+        for command in self.commands:
+            yield command
+            if isinstance(command, commands.Group):
+                yield from command.walk_commands()
+
+    def get_cog(self, name):
+        return self.cogs.get(name)
+
+    async def is_owner(self, user):
+        return user.id in self.owner_ids
+
+    async def can_run(self, ctx, *, call_once=False):
+        return True
+
+    async def verify_permissions_hooks(self, ctx):
+        return None
+
+    # Quoted, in the class body commands is the property above
+    def add_cog(self, cog: "commands.Cog"):
+        """Mirrors what Red does, without the Permissions cog loaded"""
+        self.cogs[cog.qualified_name] = cog
+        cog.requires.ready_event.set()
+        for command in cog.walk_commands():
+            command.cog = cog
+            command.requires.ready_event.set()
+            if command.parent is None:
+                self.all_commands[command.name] = command
+                for alias in command.aliases:
+                    self.all_commands[alias] = command
+
+
+def make_check(allowed: bool) -> Callable:
+    async def predicate(ctx):
+        await asyncio.sleep(0)
+        return allowed
+
+    return commands.check(predicate)
+
+
+def make_cog(index: int, args) -> commands.Cog:
+    """A cog class with args.commands top level commands, the first args.groups being groups"""
+    namespace = {"__doc__": f"Synthetic cog number {index}."}
+    counter = 0
+
+    def new_command(name, parent=None, group=False):
+        nonlocal counter
+        counter += 1
+        attr = f"cmd_{counter}"
+
+        async def callback(self, ctx):
+            pass
+
+        callback.__name__ = attr
+        decorator = (parent or commands).group if group else (parent or commands).command
+        # Red's decorators drop help=, the help comes from the docstring
+        callback.__doc__ = DOCSTRING
+        command = decorator(name=name, aliases=[f"{name}alias"])(callback)
+        for check_index in range(args.checks):
+            denied = args.deny_every and counter % args.deny_every == 0 and check_index == 0
+            make_check(not denied)(command)
+        namespace[attr] = command
+        return command
+
+    def add_subcommands(parent, prefix, depth):
+        for sub in range(args.width):
+            name = f"{prefix}{sub}"
+            child = new_command(name, parent, group=depth > 1)
+            if depth > 1:
+                add_subcommands(child, name + "s", depth - 1)
+
+    for com in range(args.commands):
+        name = f"c{index}x{com}"
+        if com < args.groups and args.depth:
+            add_subcommands(new_command(name, group=True), name + "s", args.depth)
+        else:
+            new_command(name)
+
+    cog_class = type(f"BenchCog{index}", (commands.Cog,), namespace)
+    return cog_class()
+
+
+def build_bot(args) -> BenchBot:
+    bot = BenchBot(owner=args.owner, embeds=not args.no_embeds)
+    for index in range(args.cogs):
+        bot.add_cog(make_cog(index, args))
+
+    GLOBAL_CATEGORIES.clear()
+    cog_names = list(bot.cogs)
+    per_category = max(1, len(cog_names) // (args.categories + 1))
+    for cat in range(args.categories):
+        GLOBAL_CATEGORIES.append(
+            Category(
+                name=f"category{cat}",
+                desc=f"Synthetic category {cat}",
+                cogs=cog_names[cat * per_category : (cat + 1) * per_category],
+                reaction="🍞",
+            )
+        )
+    GLOBAL_CATEGORIES.append(
+        Category(
+            name="uncategorised",
+            desc="Uncategorised",
+            cogs=cog_names[args.categories * per_category :],
+            is_uncat=True,
+        )
+    )
+    return bot
+
+
+def make_ctx(bot: BenchBot) -> BenchContext:
+    message = SimpleNamespace(
+        id=5,
+        author=bot.author,
+        channel=BenchChannel(),
+        guild=None,
+        content="!help",
+        _state=None,
+        to_reference=lambda **kwargs: None,
+    )
+    return BenchContext(
+        message=message, bot=bot, view=StringView(""), prefix="!", invoked_with="help"
+    )
+
+
+def make_formatter(bot: BenchBot, theme: Optional[str]) -> BaguetteHelp:
+    """Binds a theme the same way cog_load does, None is plain BaguetteHelp"""
+    formatter = BaguetteHelp(bot, dict(FORMATTER_SETTINGS), {"nsfw": [], "dev": []})
+    if theme is not None:
+        for feature in themes.list.features(theme):
+            if feature in THEME_FEATURES:
+                method = getattr(themes.list[theme], feature)
+                setattr(formatter, feature, MethodType(method, formatter))
+    bot._help_formatter = formatter
+    return formatter
+
+
+def pick_targets(bot: BenchBot):
+    """feature -> help target rendered by it"""
+    cog = bot.cogs[next(iter(bot.cogs))]
+    deepest = max(bot.walk_commands(), key=lambda command: len(command.parents))
+    return {
+        "format_bot_help": None,
+        "format_category_help": next(iter(GLOBAL_CATEGORIES)),
+        "format_cog_help": cog,
+        "format_command_help": deepest.root_parent or deepest,
+    }
+
+
+async def render_once(
+    formatter: BaguetteHelp, bot, target, help_settings, warm: bool, cold_metadata
+):
+    if not warm:
+        formatter.render_cache.clear()
+    if cold_metadata:
+        clear_command_metadata()
+    rendered = await formatter.render(make_ctx(bot), target, help_settings)
+    if rendered and rendered.pages:
+        rendered.pages[0]  # built lazily, this is what gets sent
+
+
+def percentile(data: List[float], pct: int) -> float:
+    if len(data) < 2:
+        return data[0]
+    return statistics.quantiles(data, n=100, method="inclusive")[pct - 1]
+
+
+async def bench_feature(formatter, bot, target, help_settings, args) -> dict:
+    for __ in range(args.warmup):
+        await render_once(formatter, bot, target, help_settings, args.warm, args.cold_metadata)
+
+    timings = []
+    for __ in range(args.iterations):
+        start = time.perf_counter()
+        await render_once(formatter, bot, target, help_settings, args.warm, args.cold_metadata)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    await render_once(formatter, bot, target, help_settings, args.warm, args.cold_metadata)
+    __, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50": percentile(timings, 50),
+        "p90": percentile(timings, 90),
+        "p99": percentile(timings, 99),
+        "max": max(timings),
+        "peak_kib": peak / 1024,
+    }
+
+
+async def main(args):
+    bot = build_bot(args)
+    help_settings = dataclasses.replace(
+        HelpSettings(),
+        verify_checks=not args.no_verify,
+        show_hidden=args.show_hidden,
+        use_menus=True,
+    )
+    targets = pick_targets(bot)
+    command_count = sum(1 for __ in bot.walk_commands())
+    print(
+        f"{len(bot.cogs)} cogs, {command_count} commands, {len(GLOBAL_CATEGORIES)} categories, "
+        f"{args.checks} checks per command, {args.iterations} iterations"
+        f"{', warm render cache' if args.warm else ''}\n"
+    )
+
+    header = f"{'theme':<12} {'feature':<22} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'peak KiB':>10}"
+    print(header)
+    print("-" * len(header))
+    for theme in [None, *(args.themes or themes.list)]:
+        formatter = make_formatter(bot, theme)
+        features = THEME_FEATURES if theme is None else themes.list.features(theme)
+        for feature in THEME_FEATURES:
+            if feature not in features:
+                continue
+            result = await bench_feature(formatter, bot, targets[feature], help_settings, args)
+            print(
+                f"{theme or 'baguette':<12} {feature:<22} {result['p50']:>9.2f} {result['p90']:>9.2f} "
+                f"{result['p99']:>9.2f} {result['max']:>9.2f} {result['peak_kib']:>10.1f}"
+            )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cogs", type=int, default=30, help="Number of cogs")
+    parser.add_argument("--commands", type=int, default=12, help="Top level commands per cog")
+    parser.add_argument("--groups", type=int, default=2, help="How many of those are groups")
+    parser.add_argument("--depth", type=int, default=2, help="Subcommand nesting of the groups")
+    parser.add_argument("--width", type=int, default=3, help="Subcommands per group level")
+    parser.add_argument(
+        "--categories", type=int, default=5, help="Categories besides uncategorised"
+    )
+    parser.add_argument("--checks", type=int, default=1, help="Checks on every command")
+    parser.add_argument(
+        "--deny-every",
+        type=int,
+        default=0,
+        help="Fail the checks of every Nth command, 0 for never",
+    )
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument(
+        "--themes", nargs="*", choices=list(themes.list), help="Themes to run, all by default"
+    )
+    parser.add_argument("--owner", action="store_true", help="Render as the bot owner")
+    parser.add_argument("--no-embeds", action="store_true", help="Render the plain text pages")
+    parser.add_argument("--no-verify", action="store_true", help="Don't run the command checks")
+    parser.add_argument("--show-hidden", action="store_true")
+    parser.add_argument("--warm", action="store_true", help="Keep the render cache between runs")
+    parser.add_argument(
+        "--cold-metadata", action="store_true", help="Drop the command metadata between runs too"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -9,6 +9,8 @@ class ThemesMeta:
     embed_template: FunctionType
     filter_categories: FunctionType
     send_pages: FunctionType
+    send_notice: FunctionType
+    help_context: FunctionType
 
     help_filter_func: FunctionType
 
@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from .stats import HelpStats
 
 if TYPE_CHECKING:
     from customhelp.core.category import Arrow, Category
@@ -25,39 +27,94 @@ class ArrowManager:
 
 
 class CategoryManager:
+    """Ordered categories, indexed by name and by the cogs in them"""
+
     def __init__(self) -> None:
-        self._list: List[Category] = []
+        self._categories: Dict[str, Category] = {}  # dicts keep the insertion order
+        self._positions: Dict[str, int] = {}
+        self._cog_index: Dict[str, Category] = {}  # cog_name -> category
+        self._uncategorised: Optional[Category] = None
 
     @property
     def uncategorised(self):
-        for category in self._list:
-            if category.is_uncat:
-                return category
-        raise RuntimeError("Uncategorised category not set!")
+        if self._uncategorised is None:
+            raise RuntimeError("Uncategorised category not set!")
+        return self._uncategorised
 
     def get(self, name):
-        return self._list[self.index(name)]
+        try:
+            return self._categories[name]
+        except KeyError:
+            raise ValueError(f"{name} is not a category") from None
 
-    # TODO remove redundant methods
-    def clear(self):
-        self._list.clear()
+    def find(self, name) -> Optional["Category"]:
+        return self._categories.get(name)
 
     def index(self, name):
-        return self._list.index(name)
+        try:
+            return self._positions[name]
+        except KeyError:
+            raise ValueError(f"{name} is not a category") from None
+
+    def category_of(self, cog_name) -> Optional["Category"]:
+        """The category the cog belongs to"""
+        return self._cog_index.get(cog_name)
+
+    def clear(self):
+        self._categories.clear()
+        self._positions.clear()
+        self._cog_index.clear()
+        self._uncategorised = None
 
     def append(self, value):
-        self._list.append(value)
+        self._positions[value.name] = len(self._categories)
+        self._categories[value.name] = value
+        for cog_name in value.cogs:
+            self._cog_index[cog_name] = value
+        if value.is_uncat:
+            self._uncategorised = value
+
+    def replace(self, categories):
+        """Swaps in a new ordered list of categories, objects that are kept stay as they are"""
+        self.clear()
+        for category in categories:
+            self.append(category)
+
+    def add_cog(self, category, cog_name, position: Optional[int] = None):
+        if position is None:
+            category.cogs.append(cog_name)
+        else:
+            category.cogs.insert(position, cog_name)
+        self._cog_index[cog_name] = category
+
+    def remove_cog(self, cog_name) -> Optional["Category"]:
+        """Takes the cog out of its category, returns that category"""
+        if (category := self._cog_index.pop(cog_name, None)) is not None:
+            category.cogs.remove(cog_name)
+        return category
+
+    def set_cogs(self, category, cogs: List[str]):
+        for cog_name in category.cogs:
+            if self._cog_index.get(cog_name) is category:
+                del self._cog_index[cog_name]
+        category.cogs = cogs
+        for cog_name in cogs:
+            self._cog_index[cog_name] = category
+
+    def __contains__(self, name):
+        return name in self._categories
 
     def __len__(self):
-        return len(self._list)
+        return len(self._categories)
 
     def __bool__(self):
-        return bool(self._list)
+        return bool(self._categories)
 
     def __iter__(self):
-        return iter(self._list)
+        return iter(self._categories.values())
 
 
 # Keeping all global vars in one place
 GLOBAL_CATEGORIES = CategoryManager()
 ARROWS = ArrowManager()
+HELP_STATS = HelpStats()
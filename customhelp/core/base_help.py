@@ -1,35 +1,49 @@
 import asyncio
+import functools
 import logging
-from collections import Counter, namedtuple
-from collections.abc import Iterable
+import time
+import weakref
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from collections.abc import Iterable, Sequence
+from contextvars import ContextVar
+from copy import copy
+from dataclasses import dataclass
 from itertools import chain
-from typing import Any, Dict, List, Optional, Union, cast
+from types import SimpleNamespace
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Union, cast
 
 import discord
 from redbot.core import commands
 from redbot.core.commands.commands import Command
 from redbot.core.commands.context import Context
 from redbot.core.commands.help import HelpSettings, NoCommand, NoSubCommand, _, dpy_commands
+from redbot.core.commands.requires import PrivilegeLevel
+from redbot.core.i18n import get_locale
 from redbot.core.utils.chat_formatting import pagify
 from redbot.core.utils.mod import mass_purge
 
 from customhelp.core.views import (
+    ArrowButton,
     BaseInteractionMenu,
+    PersistentState,
     ReactButton,
     SelectArrowHelpBar,
     SelectMenuHelpBar,
 )
 
-from . import ARROWS, GLOBAL_CATEGORIES
+from . import ARROWS, GLOBAL_CATEGORIES, HELP_STATS
 from .category import Category, get_category
-from .dpy_menus import BaseMenu, arrow_react, home_react, react_page
-from .utils import (
-    get_aliases,
-    get_category_page_mapper_chunk,
-    get_cooldowns,
-    get_perms,
-    shorten_line,
+from .dpy_menus import (
+    ARROW_PRIORITY,
+    CATEGORY_PRIORITY,
+    HOME_PRIORITY,
+    BaseMenu,
+    arrow_react,
+    home_react,
+    react_page,
 )
+from .search import SearchIndex
+from .utils import get_aliases, get_category_page_mapper_chunk, get_command_metadata
 
 LOG = logging.getLogger("red.customhelp.core.base_help")
 
@@ -43,11 +57,418 @@ HelpTarget = Union[
 ]
 
 EmbedField = namedtuple("EmbedField", "name value inline")
+CachedRender = namedtuple("CachedRender", "pages embed page_mapping")
 EMPTY_STRING = "\N{ZERO WIDTH SPACE}"
+# Commands shown by help search
+SEARCH_LIMIT = 25
+# Discord's limits on a single embed
+EMBED_TOTAL_LIMIT = 6000
+EMBED_FIELD_LIMIT = 25
+
+# The formatter methods a theme can replace
+THEME_FEATURES = (
+    "format_bot_help",
+    "format_category_help",
+    "format_cog_help",
+    "format_command_help",
+)
+
+
+class RenderCapture:
+    """Where send_pages puts the pages of the render running in the current task
+
+    Messages the formatter sends besides the pages (see BaguetteHelp.send_notice) are kept
+    as well, everyone sharing the render gets them."""
+
+    __slots__ = ("key", "tags", "rendered", "notices")
+
+    def __init__(self, key: tuple, tags: Tuple[str, ...]):
+        self.key = key
+        self.tags = tags
+        self.rendered: Optional[CachedRender] = None
+        self.notices: List[str] = []
+
+
+# Set by BaguetteHelp._render while a formatter runs. Each task has its own value, so
+# concurrent renders on the same ctx (menu clicks) can't take each other's pages
+_render_capture: ContextVar[Optional[RenderCapture]] = ContextVar(
+    "customhelp_render_capture", default=None
+)
+
+
+def timed(phase: str):
+    """Records how long the decorated coroutine takes in HELP_STATS"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with HELP_STATS.timer(phase):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def page_description(description, page_num: int, page_count: int) -> str:
+    return _("Page {page_num} of {page_count}\n{content_description}").format(
+        content_description=description,
+        page_num=page_num,
+        page_count=page_count,
+    )
+
+
+def embed_overhead(embed_dict: dict, author_name: str, page_count: int) -> int:
+    """Characters of a help embed page besides its fields, counted the way Discord does"""
+    description = embed_dict["embed"]["description"]
+    if page_count > 1:
+        # The last page has the longest page number
+        description = page_description(description, page_count, page_count)
+    return (
+        len(embed_dict["embed"]["title"] or "")
+        + len(description or "")
+        + len(embed_dict["footer"]["text"] or "")
+        + len(author_name)
+    )
+
+
+def pack_embed_fields(fields: List[EmbedField], page_char_limit: int, overhead) -> List[list]:
+    """Splits the fields into as few pages as possible, keeping their order
+
+    A page takes fields while they stay under page_char_limit (the first two fields and
+    oversized ones still go in, same as RedHelpFormatter.group_embed_fields), but never past
+    Discord's limits. overhead(page_count) is the size of everything else on a page, it
+    grows with the "Page X of Y" header, so the fields are packed again until the page count
+    settles. Filling each page before starting the next one gives the fewest pages when the
+    order is fixed."""
+    page_count = 1
+    while True:
+        hard_limit = EMBED_TOTAL_LIMIT - overhead(page_count)
+        groups: List[list] = []
+        current: list = []
+        size = 0
+        for index, field in enumerate(fields):
+            length = len(field.name) + len(field.value)
+            fits = len(current) < EMBED_FIELD_LIMIT and size + length <= hard_limit
+            if current and not (fits and (size + length < page_char_limit or index < 2)):
+                groups.append(current)
+                current, size = [], 0
+            current.append(field)
+            size += length
+        if current:
+            groups.append(current)
+        if len(groups) <= page_count:
+            return groups
+        page_count = len(groups)
+
+
+class EmbedPages(Sequence):
+    """Embed pages that are only built when accessed
+
+    The page count is known up front from the grouped fields, but only the last
+    few viewed pages are kept as actual Embeds."""
+
+    def __init__(
+        self, embed_dict: dict, field_groups: list, color, author_info: dict, thumbnail_url
+    ):
+        self.embed_dict = embed_dict
+        self.field_groups = field_groups
+        self.color = color
+        self.author_info = author_info
+        self.thumbnail_url = thumbnail_url
+        self._built: "OrderedDict[int, discord.Embed]" = OrderedDict()
+        self._built_limit = 2
+
+    def __len__(self):
+        # No fields can happen on single command without a docstring, that's still a page
+        return len(self.field_groups) or 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+
+        if (embed := self._built.get(index)) is None:
+            embed = self._built[index] = self._build(index)
+            if len(self._built) > self._built_limit:
+                self._built.popitem(last=False)
+        else:
+            self._built.move_to_end(index)
+        return embed
+
+    def _build(self, index: int) -> discord.Embed:
+        embed = discord.Embed(color=self.color, **self.embed_dict["embed"])
+        page_count = len(self.field_groups)
+        if page_count > 1:
+            embed.description = page_description(embed.description, index + 1, page_count)
+
+        embed.set_author(**self.author_info)
+        if self.field_groups:
+            for field in self.field_groups[index]:
+                embed.add_field(**field._asdict())
+
+        embed.set_footer(**self.embed_dict["footer"])
+        if self.thumbnail_url:
+            embed.set_thumbnail(url=self.thumbnail_url)
+        return embed
+
+
+class RenderCache:
+    """LRU of rendered help pages, keyed by (help target, audience fingerprint)
+
+    Entries also expire after `ttl` seconds, as custom check predicates can't be captured in
+    the fingerprint. Permission rules can't either, the cog clears the cache whenever a
+    Permissions command runs. Each entry is tagged with what it
+    mentions (see BaguetteHelp.render_tags) and with the feature that rendered it, so a cog
+    change or a theme swap only drops the pages concerned."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[tuple, tuple[float, CachedRender, frozenset]]" = OrderedDict()
+        self._tags: Dict[str, Set[tuple]] = defaultdict(set)
+
+    def get(self, key: tuple) -> Optional[CachedRender]:
+        try:
+            created, value, __ = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        if time.monotonic() - created > self.ttl:
+            self._drop(key)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: tuple, value: CachedRender, tags: Iterable[str] = ()):
+        if key in self._data:
+            self._drop(key)
+        tags = frozenset(tags)
+        self._data[key] = (time.monotonic(), value, tags)
+        for tag in tags:
+            self._tags[tag].add(key)
+        while len(self._data) > self.maxsize:
+            self._drop(next(iter(self._data)))
+
+    def _drop(self, key: tuple):
+        __, __, tags = self._data.pop(key)
+        for tag in tags:
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def invalidate(self, *tags: str) -> int:
+        """Drops every entry tagged with any of the tags, returns how many were dropped"""
+        keys = set().union(*(self._tags.get(tag, ()) for tag in tags))
+        for key in keys:
+            self._drop(key)
+        return len(keys)
+
+    def clear(self):
+        self._data.clear()
+        self._tags.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CommandIndex:
+    """Every way of typing a command (qualified names and aliases) mapped to the command
+
+    Built on first use and patched when cogs are added or removed. Anything not found here
+    still goes through the usual walk, so commands added outside of cogs aren't missed."""
+
+    def __init__(self):
+        self._index: Optional[Dict[str, commands.Command]] = None
+        # Bumped on every change, so build_async knows when its snapshot went stale
+        self._generation = 0
+
+    def build(self, bot):
+        if self._index is None:
+            self._index = dict(self._paths(bot.all_commands))
+
+    async def build_async(self, bot, batch: int = 50):
+        """build, letting the event loop run every `batch` top level commands"""
+        if self._index is not None:
+            return
+        generation = self._generation
+        index: Dict[str, commands.Command] = {}
+        for count, (name, command) in enumerate(list(bot.all_commands.items()), 1):
+            index.update(self._paths({name: command}))
+            if count % batch == 0:
+                await asyncio.sleep(0)
+        if self._index is None and self._generation == generation:
+            self._index = index
+
+    def get(self, bot, name: str) -> Optional[commands.Command]:
+        self.build(bot)
+        return self._index.get(name)
+
+    @classmethod
+    def _paths(cls, all_commands: dict, prefix: str = ""):
+        # all_commands has the aliases as keys as well
+        for name, command in all_commands.items():
+            path = prefix + name
+            yield path, command
+            if hasattr(command, "all_commands"):
+                yield from cls._paths(command.all_commands, path + " ")
+
+    @staticmethod
+    def _roots(cog: commands.Cog) -> dict:
+        return {
+            name: command
+            for command in cog.get_commands()
+            for name in (command.name, *command.aliases)
+        }
+
+    def add_cog(self, cog: commands.Cog):
+        self._generation += 1
+        if self._index is not None:
+            self._index.update(self._paths(self._roots(cog)))
+
+    def remove_cog(self, cog: commands.Cog):
+        self._generation += 1
+        if self._index is not None:
+            # By command.cog, the cog's subcommands of other cogs' groups aren't under its roots
+            for path in [path for path, command in self._index.items() if command.cog is cog]:
+                del self._index[path]
+
+    def invalidate(self):
+        self._generation += 1
+        self._index = None
+
+
+class AliasCache:
+    """Aliases of the Alias cog per guild, and the help targets built for them
+
+    Alias doesn't dispatch anything when aliases change, so the cog clears this
+    whenever an Alias command completes."""
+
+    def __init__(self):
+        self._aliases: Dict[Optional[int], Dict[str, str]] = {}
+        # (guild_id, alias_name) -> (aliased command, help target)
+        self._targets: Dict[Tuple[Optional[int], str], Tuple[commands.Command, Any]] = {}
+
+    async def get(self, alias_cog, guild, alias_name: str) -> Optional[str]:
+        """The command string behind the alias, if it is one"""
+        if " " in alias_name:  # Alias names can't have spaces
+            return None
+        guild_id = guild.id if guild else None
+        if (aliases := self._aliases.get(guild_id)) is None:
+            entries = await alias_cog._aliases.get_global_aliases()
+            if guild:
+                entries = await alias_cog._aliases.get_guild_aliases(guild) + entries
+            # global aliases take priority, same as AliasCache.get_alias
+            aliases = self._aliases[guild_id] = {entry.name: entry.command for entry in entries}
+        return aliases.get(alias_name)
+
+    def get_target(self, guild, alias_name: str, com: commands.Command):
+        """Help target for the alias, the copy is only made once per alias"""
+        key = (guild.id if guild else None, alias_name)
+        if (cached := self._targets.get(key)) and cached[0] is com:
+            return cached[1]
+        com_alias = com.copy()
+        com_alias.parent = None
+        com_alias.cog = com.cog
+        com_alias.name = alias_name
+        # copy() can share the aliases list with the original command
+        com_alias.aliases = [*com_alias.aliases, com.qualified_name]
+        self._targets[key] = (com, com_alias)
+        return com_alias
+
+    def remove_cog(self, cog: commands.Cog):
+        """Forgets the help targets made for commands of the cog"""
+        self._targets = {
+            key: cached for key, cached in self._targets.items() if cached[0].cog is not cog
+        }
+
+    def clear(self):
+        self._aliases.clear()
+        self._targets.clear()
+
+
+class VisibilityOracle:
+    """Memoized can_see/can_run results for one help invocation
+
+    It's kept for as long as the invoking ctx is alive, so menus reuse the results
+    on category switches. Checks are run concurrently, each worker on its own copy of ctx
+    because can_run swaps ctx.command while it runs."""
+
+    def __init__(self, concurrency: int = 8):
+        self.concurrency = concurrency
+        self._can_see: Dict[Any, bool] = {}
+        self._can_run: Dict[Any, bool] = {}
+
+    async def filter(self, ctx, objects, help_settings: HelpSettings, bypass_hidden=False):
+        """Same rules as RedHelpFormatter.help_filter_func, but batched"""
+        show_hidden = bypass_hidden or help_settings.show_hidden
+        objects = list(objects)
+        if help_settings.verify_checks and not show_hidden:
+            results, check = self._can_see, self._check_can_see
+        elif help_settings.verify_checks:
+            results, check = self._can_run, self._check_can_run
+        elif not show_hidden:
+            return [obj for obj in objects if not getattr(obj, "hidden", False)]
+        else:
+            return objects
+
+        # Disabled commands are hidden whatever the checks say, same as core
+        objects = [obj for obj in objects if getattr(obj, "enabled", True)]
+        pending = [obj for obj in objects if obj not in results]
+        queue = iter(pending)
+
+        async def worker(worker_ctx):
+            for obj in queue:  # shared between the workers
+                results[obj] = await check(worker_ctx, obj)
+
+        workers = min(self.concurrency, len(pending))
+        await asyncio.gather(*(worker(copy(ctx)) for __ in range(workers)))
+        return [obj for obj in objects if results[obj]]
+
+    @staticmethod
+    async def _check_can_see(ctx, obj) -> bool:
+        return await obj.can_see(ctx)
+
+    @staticmethod
+    async def _check_can_run(ctx, obj) -> bool:
+        try:
+            return await obj.can_run(ctx)
+        except discord.DiscordException:
+            return False
+
+
+@dataclass
+class HelpContext:
+    """Everything about one help invocation that the formatter and themes keep asking for
+
+    Built once per ctx by BaguetteHelp.help_context, so owner checks, config reads
+    and the blacklist lookups happen once instead of once per category."""
+
+    is_owner: bool
+    nsfw: bool
+    help_settings: HelpSettings
+    embed_color: discord.Color
+    embed_requested: bool
+    clean_prefix: str
+    # categories hidden from this invoker by the nsfw and dev blacklists
+    hidden: FrozenSet[str]
+    oracle: VisibilityOracle
+    fingerprint: Optional[tuple] = None
+
+    def can_see_category(self, category) -> bool:
+        return getattr(category, "name", category) not in self.hidden
 
 
 # Note to anyone reading this, This is the default formatter deffo, just slightly edited.
-# page_mapping = { category_obj: generated_category_format_page}
+# page_mapping = { category_obj: generated_category_format_page or None (rendered lazily)}
 class BaguetteHelp(commands.RedHelpFormatter):
     """In the memory of Jack the virgin"""
 
@@ -55,9 +476,28 @@ class BaguetteHelp(commands.RedHelpFormatter):
         self.bot = bot
         self.settings = settings
         self.blacklist_names = blacklist
-
-    @staticmethod
-    async def parse_command(ctx, help_for: str) -> HelpTarget:
+        self.render_cache = RenderCache()
+        # Visible subcommands of groups and their formatted blocks, per audience tier
+        self.group_cache = RenderCache(maxsize=512)
+        self.command_index = CommandIndex()
+        self.alias_cache = AliasCache()
+        self._contexts: "weakref.WeakKeyDictionary[Context, HelpContext]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # render cache key -> the render in progress, concurrent identical helps wait on it
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        # Renders that waited on an identical one instead of running
+        self.renders_shared = 0
+        # Render audiences whose home and category pages were pre-rendered, and the tasks doing it
+        self._prerendered = RenderCache()
+        self._prerender_tasks: Set[asyncio.Task] = set()
+        self.persistent_menus = PersistentMenus(self)
+        self.live_menus = MenuRegistry()
+        self.search_index = SearchIndex()
+        # Messages not sent thanks to pack_pages
+        self.api_calls_saved = 0
+
+    async def parse_command(self, ctx, help_for: str) -> HelpTarget:
         """
         Handles parsing
         """
@@ -70,16 +510,22 @@ class BaguetteHelp(commands.RedHelpFormatter):
         if maybe_cateory:
             return maybe_cateory
 
-        alias = None
-        alias_name = None
+        help_for = " ".join(help_for.split())
+        if com := self.command_index.get(ctx.bot, help_for):
+            return com
+
         # TODO does this wreck havoc?
         if alias_cog := ctx.bot.get_cog("Alias"):
-            alias_name = help_for
-            alias = await alias_cog._aliases.get_alias(ctx.guild, alias_name=alias_name)
-            if alias:
-                help_for = alias.command
+            if alias_command := await self.alias_cache.get(alias_cog, ctx.guild, help_for):
+                com = self.walk_command(ctx.bot, alias_command)
+                return self.alias_cache.get_target(ctx.guild, help_for, com)
 
-        com = ctx.bot
+        # Not in the index, walk it to find out where it went wrong
+        return self.walk_command(ctx.bot, help_for)
+
+    @staticmethod
+    def walk_command(bot, help_for: str):
+        com = bot
         last = None
 
         clist = help_for.split()
@@ -87,8 +533,6 @@ class BaguetteHelp(commands.RedHelpFormatter):
         for index, item in enumerate(clist):
             try:
                 com = com.all_commands[item]
-                # TODO: This doesn't handle valid command aliases.
-                # swap parsing method to use get_command.
             except (KeyError, AttributeError):
                 if last:
                     raise NoSubCommand(last=last, not_found=clist[index:]) from None
@@ -96,16 +540,80 @@ class BaguetteHelp(commands.RedHelpFormatter):
                     raise NoCommand() from None
             else:
                 last = com
-        # This does take an extra 0.1 seconds to complete. but worth it?
-        if alias and alias_name:
-            com_alias = com.copy()
-            com_alias.parent = None
-            com_alias.cog = com.cog
-            com_alias.name = alias_name
-            com_alias.aliases.append(com.qualified_name)
-            return com_alias
         return com
 
+    async def help_context(
+        self, ctx: Context, help_settings: Optional[HelpSettings] = None
+    ) -> HelpContext:
+        """The HelpContext of this invocation, built on first use"""
+        if (hctx := self._contexts.get(ctx)) is not None:
+            return hctx
+        if help_settings is None:
+            help_settings = await HelpSettings.from_context(ctx)
+        is_owner = await ctx.bot.is_owner(ctx.author)
+        nsfw = ctx.channel.is_nsfw() if hasattr(ctx.channel, "is_nsfw") else True
+        hidden = set()
+        if not nsfw:
+            hidden.update(self.blacklist_names["nsfw"])
+        if not is_owner:
+            hidden.update(self.blacklist_names["dev"])
+        hctx = self._contexts[ctx] = HelpContext(
+            is_owner=is_owner,
+            nsfw=nsfw,
+            help_settings=help_settings,
+            embed_color=await ctx.embed_color(),
+            embed_requested=await ctx.embed_requested(),
+            clean_prefix=ctx.clean_prefix,
+            hidden=frozenset(hidden),
+            oracle=VisibilityOracle(),
+        )
+        return hctx
+
+    async def prewarm(self):
+        """Builds what every help invocation shares, so the first help after a load is fast
+
+        That's the command index, the search index and the command metadata, for the global
+        prefixes and the bot's own name. Guild prefixes and nicknames are left to the first
+        help there, warming every combination doesn't scale on big bots. The pages themselves
+        are pre-rendered per tier once it is seen, see prerender."""
+        bot = self.bot
+        start = time.perf_counter()
+        await self.command_index.build_async(bot)
+        await self.search_index.build_async(bot)
+        # The shortdocs only need clean_prefix and me from the ctx, mention prefixes are skipped
+        stand_ins = [
+            SimpleNamespace(clean_prefix=prefix, me=bot.user)
+            for prefix in await bot.get_valid_prefixes()
+            if not prefix.startswith("<@")
+        ]
+        thumbnail = self.settings["thumbnail"]
+        warmed = 0
+        for category in GLOBAL_CATEGORIES:
+            for cog_name in category.cogs:
+                if cog := bot.get_cog(cog_name):
+                    for command in cog.walk_commands():
+                        for stand_in in stand_ins:
+                            get_command_metadata(stand_in, command, thumbnail)
+                        warmed += 1
+            # Low priority, let everything else run between categories
+            await asyncio.sleep(0)
+        LOG.info(
+            "Help pre-warmed in %.1f ms (%s commands, %s prefixes)",
+            (time.perf_counter() - start) * 1000,
+            warmed,
+            len(stand_ins),
+        )
+
+    async def help_filter_func(
+        self, ctx: Context, objects: Iterable, help_settings: HelpSettings, bypass_hidden=False
+    ):
+        """Filters through the visibility oracle of this invocation"""
+        oracle = (await self.help_context(ctx, help_settings)).oracle
+        with HELP_STATS.timer("filter"):
+            objects = await oracle.filter(ctx, objects, help_settings, bypass_hidden=bypass_hidden)
+        for obj in objects:
+            yield obj
+
     async def get_category_help_mapping(
         self, ctx, category, help_settings: HelpSettings, bypass_checks=False
     ):
@@ -114,21 +622,78 @@ class BaguetteHelp(commands.RedHelpFormatter):
             return
         sorted_iterable = []
         sorted_cogs = sorted(category.cogs)
-        isuncategory = False
-        if category.name == GLOBAL_CATEGORIES.uncategorised.name:
-            isuncategory = True
+        if category.is_uncat:
             sorted_cogs.append(None)  # TODO Need to add commands with no category here as well >_>
         for cogname in sorted_cogs:
-            cog = ctx.bot.get_cog(cogname)
-            # Simple kmaps for these conditions, math is dark magic
-            if ((not cogname) or cog) and (
-                (isuncategory and cogname is None) or (cogname in category.cogs)
-            ):
+            cog = ctx.bot.get_cog(cogname) if cogname else None
+            # None is the commands without a cog, skip the unloaded cogs
+            if cogname is None or cog:
                 cm = await self.get_cog_help_mapping(ctx, cog, help_settings=help_settings)
                 if cm:
                     sorted_iterable.append((cogname, cm))
         return sorted_iterable
 
+    async def get_group_help_mapping(self, ctx: Context, obj, help_settings: HelpSettings):
+        """Visible subcommands of the group by name, sorted, cached per audience tier"""
+        key = ("group", obj, await self.audience_tier(ctx, help_settings))
+        if (mapping := self.group_cache.get(key)) is None:
+            visible = {
+                com.name: com
+                async for com in self.help_filter_func(
+                    ctx, obj.all_commands.values(), help_settings=help_settings
+                )
+            }
+            mapping = dict(sorted(visible.items()))
+            self.group_cache.put(key, mapping)
+        return mapping
+
+    async def get_subcommand_pages(
+        self, ctx: Context, obj, subcommands: dict, help_settings: HelpSettings
+    ) -> List[str]:
+        """The subcommand lines of a group, pagified for the embed fields"""
+        key = (
+            "subtext",
+            obj,
+            await self.audience_tier(ctx, help_settings),
+            # what the metadata lines depend on
+            get_locale(),
+            ctx.clean_prefix,
+            ctx.me.display_name,
+            bool(self.settings["thumbnail"]),
+        )
+        if (pages := self.group_cache.get(key)) is None:
+            spacing = len(max(subcommands.keys(), key=len))
+            subtext = "\n" + "\n".join(
+                get_command_metadata(ctx, command, self.settings["thumbnail"]).line(name, spacing)
+                for name, command in subcommands.items()
+            )
+            pages = list(pagify(subtext, page_length=500, shorten_by=0))
+            self.group_cache.put(key, pages)
+        return pages
+
+    async def category_has_visible_commands(
+        self, ctx: Context, category: Category, help_settings: HelpSettings
+    ) -> bool:
+        """Cheaper get_category_help_mapping, stops at the first command the user can see"""
+        cogs = [ctx.bot.get_cog(cog_name) for cog_name in category.cogs]
+        if category.is_uncat:
+            cogs.append(None)
+        for cog in cogs:
+            if cog is None:
+                if not category.is_uncat:
+                    continue
+                iterator = filter(lambda c: c.parent is None and c.cog is None, ctx.bot.commands)
+            else:
+                iterator = iter(cog.get_commands())
+            async for __ in self.help_filter_func(ctx, iterator, help_settings=help_settings):
+                return True
+        return False
+
+    async def get_category_pages(self, ctx: Context, category: Category, help_settings):
+        """Renders the category pages for the menus, going through the render cache"""
+        if rendered := await self.render(ctx, category, help_settings):
+            return rendered.pages
+
     async def send_help(
         self,
         ctx: Context,
@@ -140,15 +705,17 @@ class BaguetteHelp(commands.RedHelpFormatter):
         Parses the help thing requested fora
         """
 
-        help_settings = await HelpSettings.from_context(ctx)
+        help_settings = (await self.help_context(ctx)).help_settings
 
         if help_for is None or isinstance(help_for, dpy_commands.bot.BotBase):
-            await self.format_bot_help(ctx, help_settings=help_settings)
-            return
-
-        if isinstance(help_for, str):
+            help_for = None
+        elif isinstance(help_for, str):
+            if (terms := self.search_terms(ctx, help_for)) is not None:
+                await self.format_search_help(ctx, terms, help_settings)
+                return
             try:
-                help_for = await self.parse_command(ctx, help_for)  # type:ignore
+                with HELP_STATS.timer("parse"):
+                    help_for = await self.parse_command(ctx, help_for)  # type:ignore
             except NoCommand:
                 await self.command_not_found(ctx, help_for, help_settings=help_settings)
                 return
@@ -160,12 +727,220 @@ class BaguetteHelp(commands.RedHelpFormatter):
                     return
                 help_for = exc.last
 
-        if isinstance(help_for, commands.Cog):
-            await self.format_cog_help(ctx, help_for, help_settings=help_settings)
+        if rendered := await self.render(ctx, help_for, help_settings):
+            await self.prerender(ctx, help_settings)
+            await self.send_pages(
+                ctx,
+                rendered.pages,
+                embed=rendered.embed,
+                help_settings=help_settings,
+                page_mapping=rendered.page_mapping,
+                target=self.persistent_target(help_for),
+            )
+
+    async def prerender(self, ctx: Context, help_settings: HelpSettings):
+        """Renders the home page and its categories in the background, for everyone in the tier
+
+        Only without verify_checks, the pages are shared by a whole guild then so the first
+        category click of each member is a cache hit. Done again once the pages expired."""
+        hctx = await self.help_context(ctx, help_settings)
+        if help_settings.verify_checks or not hctx.embed_requested:
+            return
+        audience = await self.render_audience(ctx, help_settings)
+        if self._prerendered.get(audience) is not None:
+            return
+        self._prerendered.put(audience, True)
+        task = asyncio.create_task(self._prerender(ctx, help_settings))
+        self._prerender_tasks.add(task)
+        task.add_done_callback(self._prerender_tasks.discard)
+
+    async def _prerender(self, ctx: Context, help_settings: HelpSettings):
+        try:
+            if home := await self.render(ctx, None, help_settings):
+                for category in home.page_mapping:
+                    await self.render(ctx, category, help_settings)
+                    # Low priority, let everything else run between categories
+                    await asyncio.sleep(0)
+        except Exception:
+            LOG.exception("Pre-rendering the help pages failed")
+
+    def cancel_prerenders(self):
+        """Stops the running pre-renders, and forgets which tiers were pre-rendered"""
+        for task in self._prerender_tasks:
+            task.cancel()
+        self._prerendered.clear()
+
+    async def render(
+        self, ctx: Context, help_for: Optional[HelpTarget], help_settings: HelpSettings
+    ) -> Optional[CachedRender]:
+        """Renders a parsed help target (None for the main page) without sending it
+
+        Goes through the render cache, returns None if the formatter had nothing to send.
+        Concurrent renders of the same target for the same audience run only once, the
+        notices it had (see send_notice) are still sent to each caller."""
+        key = await self.render_key(ctx, help_for, help_settings)
+        if cached := self.render_cache.get(key):
+            return cached
+        while (inflight := self._inflight.get(key)) is not None:
+            try:
+                capture = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The render we waited on got cancelled, the first waiter takes over
+            else:
+                self.renders_shared += 1
+                break
+        else:
+            inflight = self._inflight[key] = asyncio.get_running_loop().create_future()
+            try:
+                capture = await self._render(ctx, key, help_for, help_settings)
+            except Exception as exc:
+                inflight.set_exception(exc)
+                inflight.exception()  # no "never retrieved" warning when nobody waited
+                raise
+            except BaseException:
+                inflight.cancel()
+                raise
+            else:
+                inflight.set_result(capture)
+            finally:
+                if self._inflight.get(key) is inflight:
+                    del self._inflight[key]
+        # Once per caller, the render itself only collected them
+        for notice in capture.notices:
+            await ctx.send(notice)
+        return capture.rendered
+
+    async def _render(
+        self, ctx: Context, key: tuple, help_for: Optional[HelpTarget], help_settings
+    ) -> RenderCapture:
+        feature = self.feature_of(help_for)
+        args = () if help_for is None else (help_for,)
+        capture = RenderCapture(key, self.render_tags(help_for) + ("feature:" + feature,))
+        token = _render_capture.set(capture)
+        try:
+            with HELP_STATS.timer("render", self.theme_of(feature)):
+                await getattr(self, feature)(ctx, *args, help_settings=help_settings)
+        finally:
+            _render_capture.reset(token)
+        return capture
+
+    async def send_notice(self, ctx: Context, content: str):
+        """Sends a message that isn't part of the help pages, like the enable embeds one
+
+        During a render it's sent once the render is done, to every caller sharing it."""
+        if (capture := _render_capture.get()) is not None:
+            capture.notices.append(content)
+        else:
+            await ctx.send(content)
+
+    @staticmethod
+    def feature_of(help_for: Optional[HelpTarget]) -> str:
+        """The formatter method that renders a help target"""
+        if help_for is None:
+            return "format_bot_help"
+        elif isinstance(help_for, commands.Cog):
+            return "format_cog_help"
+        elif isinstance(help_for, Category):
+            return "format_category_help"
+        return "format_command_help"
+
+    def theme_of(self, feature: str) -> str:
+        """Name of the theme the feature is bound to"""
+        func = getattr(self, feature).__func__
+        if func is getattr(BaguetteHelp, feature):
+            return "default"
+        # The theme name is the module name
+        return func.__module__.rpartition(".")[2]
+
+    @staticmethod
+    def render_tags(help_for: Optional[HelpTarget]) -> Tuple[str, ...]:
+        """What the pages of a help target are about, for RenderCache.invalidate"""
+        if help_for is None:
+            return ("bot",)
+        elif isinstance(help_for, commands.Cog):
+            return ("cog:" + help_for.qualified_name,)
+        elif isinstance(help_for, Category):
+            return ("category:" + help_for.name,)
+        return ("cog:" + (help_for.cog.qualified_name if help_for.cog else ""),)
+
+    @staticmethod
+    def persistent_target(help_for: Optional[HelpTarget]) -> str:
+        """The help target, as stored in the custom_id of persistent menus"""
+        if help_for is None:
+            return "h:"
+        elif isinstance(help_for, commands.Cog):
+            return "c:" + help_for.qualified_name
+        elif isinstance(help_for, Category):
+            return "k:" + help_for.name
+        return "m:" + help_for.qualified_name
+
+    async def render_key(self, ctx: Context, help_for, help_settings: HelpSettings) -> tuple:
+        """Cache key of a help target, for everyone who'd see the exact same pages"""
+        if help_for is None:
+            target = ("bot",)
+        elif isinstance(help_for, commands.Cog):
+            target = ("cog", help_for.qualified_name)
         elif isinstance(help_for, Category):
-            await self.format_category_help(ctx, help_for, help_settings=help_settings)
+            target = ("category", help_for.name)
         else:
-            await self.format_command_help(ctx, help_for, help_settings=help_settings)
+            # get_aliases hides the alias that was used to invoke help
+            target = ("command", help_for.qualified_name, ctx.invoked_with)
+        # Only the theme rendering it, so loading a theme keeps the other features' pages
+        theme = getattr(self, self.feature_of(help_for)).__qualname__
+        return target + (theme,) + await self.render_audience(ctx, help_settings)
+
+    async def render_audience(self, ctx: Context, help_settings: HelpSettings) -> tuple:
+        """The audience part of render keys, everyone in it gets the exact same pages
+
+        Without verify_checks the pages don't depend on the channel or the invoker's roles,
+        only on the guild, the blacklisted categories and the look of the embeds."""
+        if help_settings.verify_checks:
+            return await self.audience_fingerprint(ctx, help_settings)
+        hctx = await self.help_context(ctx, help_settings)
+        return await self.audience_tier(ctx, help_settings) + (
+            ctx.guild.id if ctx.guild else None,
+            hctx.hidden,
+            hctx.clean_prefix,
+            help_settings,
+            hctx.embed_color,
+            hctx.embed_requested,
+        )
+
+    async def audience_tier(self, ctx: Context, help_settings: HelpSettings) -> tuple:
+        """The part of the audience that decides which commands are visible
+
+        Without verify_checks that's only whether hidden commands are shown, so everyone
+        shares the same tier. Otherwise checks can depend on anything about the invoker."""
+        if not help_settings.verify_checks:
+            return ("anyone", help_settings.show_hidden)
+        return await self.audience_fingerprint(ctx, help_settings)
+
+    async def audience_fingerprint(self, ctx: Context, help_settings: HelpSettings) -> tuple:
+        """Everything about the invoker that can change how the help pages look"""
+        hctx = await self.help_context(ctx, help_settings)
+        if hctx.help_settings is not help_settings:
+            # Rendering with other settings than the invocation's, nothing to reuse
+            hctx = copy(hctx)
+            hctx.help_settings, hctx.fingerprint = help_settings, None
+        if hctx.fingerprint is None:
+            author = ctx.author
+            hctx.fingerprint = (
+                hctx.is_owner,
+                ctx.guild.id if ctx.guild else None,
+                ctx.channel.id,
+                hctx.nsfw,
+                await PrivilegeLevel.from_ctx(ctx),
+                # role ids and channel perms, for permission rules and user_perms checks
+                frozenset(role.id for role in getattr(author, "roles", ())),
+                ctx.channel.permissions_for(author).value,
+                hctx.clean_prefix,
+                help_settings,
+                hctx.embed_color,
+                hctx.embed_requested,
+            )
+        return hctx.fingerprint
 
     async def format_category_help(
         self,
@@ -181,7 +956,7 @@ class BaguetteHelp(commands.RedHelpFormatter):
         if not coms:
             return
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
             emb["thumbnail"] = obj.thumbnail
 
@@ -193,10 +968,7 @@ class BaguetteHelp(commands.RedHelpFormatter):
             spacing = len(max(spacer_list, key=len))
             for cog_name, data in coms:
                 cog_text = "\n" + "\n".join(
-                    shorten_line(
-                        f"`{name:<{spacing}}:`{command.format_shortdoc_for_context(ctx)}",
-                        bool(obj.thumbnail),
-                    )
+                    get_command_metadata(ctx, command, obj.thumbnail).line(name, spacing)
                     for name, command in sorted(data.items())
                 )
                 all_cog_text += cog_text
@@ -213,7 +985,63 @@ class BaguetteHelp(commands.RedHelpFormatter):
             else:
                 await self.send_pages(ctx, pages, embed=True, help_settings=help_settings)
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
+
+    def search_terms(self, ctx: Context, help_for: str) -> Optional[str]:
+        """The terms of `help search <terms>`, unless there's an actual thing called search"""
+        name, __, terms = help_for.partition(" ")
+        if name.lower() != "search" or not terms.strip():
+            return None
+        if ctx.bot.get_command(name) or ctx.bot.get_cog(name) or get_category(name):
+            return None
+        return terms.strip()
+
+    async def format_search_help(self, ctx: Context, terms: str, help_settings: HelpSettings):
+        """Search results, only with the commands the invoker can see"""
+        hctx = await self.help_context(ctx, help_settings)
+        results = [
+            command
+            for command in self.search_index.search(ctx.bot, terms)
+            # Same category blacklist as the home and category pages
+            if (category := self.category_of_command(command)) is None
+            or hctx.can_see_category(category)
+        ]
+        visible: List[commands.Command] = []
+        # Best results first, so the checks only run for as many as get shown
+        for start in range(0, len(results), SEARCH_LIMIT):
+            chunk = results[start : start + SEARCH_LIMIT]
+            async for command in self.help_filter_func(ctx, chunk, help_settings=help_settings):
+                visible.append(command)
+            if len(visible) >= SEARCH_LIMIT:
+                break
+        if not visible:
+            await ctx.send(_("No commands found for {terms}").format(terms=terms))
+            return
+
+        visible = visible[:SEARCH_LIMIT]
+        spacing = len(max((command.qualified_name for command in visible), key=len))
+        command_text = "\n".join(
+            get_command_metadata(ctx, command, self.settings["thumbnail"]).line(
+                command.qualified_name, spacing
+            )
+            for command in visible
+        )
+        if hctx.embed_requested:
+            emb = await self.embed_template(help_settings, ctx)
+            emb["embed"]["title"] = _("Search results for {terms}").format(terms=terms)[:250]
+            for page in pagify(command_text, page_length=500, shorten_by=0):
+                emb["fields"].append(EmbedField(EMPTY_STRING, page, False))
+            pages = await self.make_embeds(ctx, emb, help_settings=help_settings)
+            await self.send_pages(ctx, pages, embed=True, help_settings=help_settings)
+        else:
+            pages = list(pagify(command_text, page_length=1990, shorten_by=0))
+            await self.send_pages(ctx, pages, embed=False, help_settings=help_settings)
+
+    @staticmethod
+    def category_of_command(command: commands.Command) -> Optional[Category]:
+        if command.cog is not None:
+            return GLOBAL_CATEGORIES.category_of(command.cog.__class__.__name__)
+        return GLOBAL_CATEGORIES.uncategorised if GLOBAL_CATEGORIES else None
 
     async def format_cog_help(self, ctx: Context, obj: commands.Cog, help_settings: HelpSettings):
         coms: Dict[str, Command] = await self.get_cog_help_mapping(
@@ -222,15 +1050,14 @@ class BaguetteHelp(commands.RedHelpFormatter):
         if not (coms or help_settings.verify_exists):
             return
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx, obj.format_help_for_context(ctx))
 
             if coms:
                 spacing = len(max(coms.keys(), key=len))
                 command_text = "\n".join(
-                    shorten_line(
-                        f"`{name:<{spacing}}:`{command.format_shortdoc_for_context(ctx)}",
-                        bool(self.settings["thumbnail"]),
+                    get_command_metadata(ctx, command, self.settings["thumbnail"]).line(
+                        name, spacing
                     )
                     for name, command in sorted(coms.items())
                 )
@@ -245,7 +1072,7 @@ class BaguetteHelp(commands.RedHelpFormatter):
             pages = await self.make_embeds(ctx, emb, help_settings=help_settings)
             await self.send_pages(ctx, pages, embed=True, help_settings=help_settings)
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
 
     async def format_command_help(
         self, ctx: Context, obj: commands.Command, help_settings: HelpSettings
@@ -261,19 +1088,20 @@ class BaguetteHelp(commands.RedHelpFormatter):
             return
 
         command = obj
+        metadata = get_command_metadata(ctx, command, self.settings["thumbnail"])
 
         description = command.description or ""
 
         signature = _(
             "`Syntax: {ctx.clean_prefix}{command.qualified_name} {command.signature}`"
-        ).format(ctx=ctx, command=command)
+        ).format(ctx=ctx, command=metadata)
         subcommands = None
 
         if hasattr(command, "all_commands"):
             grp = cast(commands.Group, command)
             subcommands = await self.get_group_help_mapping(ctx, grp, help_settings=help_settings)
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
 
             if description:
@@ -303,22 +1131,17 @@ class BaguetteHelp(commands.RedHelpFormatter):
                 if alias := get_aliases(command, ctx.invoked_with):
                     emb["fields"].append(EmbedField("Aliases", ",".join(alias), False))
 
-                if final_perms := get_perms(command):
+                if final_perms := metadata.perms:
                     emb["fields"].append(EmbedField("Permissions", final_perms, False))
 
-                if cooldowns := get_cooldowns(command):
+                if cooldowns := metadata.cooldowns:
                     emb["fields"].append(EmbedField("Cooldowns", "\n".join(cooldowns), False))
 
             if subcommands:
-                spacing = len(max(subcommands.keys(), key=len))
-                subtext = "\n" + "\n".join(
-                    shorten_line(
-                        f"`{name:<{spacing}}:`{command.format_shortdoc_for_context(ctx)}",
-                        bool(self.settings["thumbnail"]),
-                    )
-                    for name, command in sorted(subcommands.items())
+                subcommand_pages = await self.get_subcommand_pages(
+                    ctx, grp, subcommands, help_settings
                 )
-                for i, page in enumerate(pagify(subtext, page_length=500, shorten_by=0)):
+                for i, page in enumerate(subcommand_pages):
                     if i == 0:
                         title = _("**__Subcommands:__**")
                     else:
@@ -328,12 +1151,12 @@ class BaguetteHelp(commands.RedHelpFormatter):
             pages = await self.make_embeds(ctx, emb, help_settings=help_settings)
             await self.send_pages(ctx, pages, embed=True, help_settings=help_settings)
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
 
     async def format_bot_help(
         self, ctx: Context, help_settings: HelpSettings, get_pages: bool = False
     ):
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx, ctx.bot.description)
             filtered_categories = await self.filter_categories(ctx, GLOBAL_CATEGORIES)
 
@@ -342,7 +1165,7 @@ class BaguetteHelp(commands.RedHelpFormatter):
             for cat in filtered_categories:
                 if cat.cogs:
                     if not await get_category_page_mapper_chunk(
-                        self, False, ctx, cat, help_settings, page_mapping
+                        self, ctx, cat, help_settings, page_mapping
                     ):
                         continue
 
@@ -365,7 +1188,7 @@ class BaguetteHelp(commands.RedHelpFormatter):
                     page_mapping=page_mapping,
                 )
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
 
     # util to reduce code dupes
     async def embed_template(self, help_settings, ctx, description=None):
@@ -385,83 +1208,65 @@ class BaguetteHelp(commands.RedHelpFormatter):
         emb["footer"]["text"] = (help_settings.tagline) or self.get_default_tagline(ctx)
         return emb
 
-    # TODO maybe try lazy loading
     async def make_embeds(
         self,
         ctx,
         embed_dict: dict,
         help_settings: HelpSettings,
     ):
-        """Returns Embed pages (Really copy paste from core)"""
-        pages = []
+        """Returns Embed pages (Really copy paste from core), built lazily"""
         thumbnail_url = embed_dict.get("thumbnail", None) or self.settings["thumbnail"]
-        page_char_limit = help_settings.page_char_limit
-        page_char_limit = min(page_char_limit, 5500)
         author_info = {
             "name": _("{ctx.me.display_name} Help Menu").format(ctx=ctx),
             "icon_url": ctx.me.display_avatar.url,
         }
-        offset = len(author_info["name"]) + 20
-        foot_text = embed_dict["footer"]["text"]
-        if foot_text:
-            offset += len(foot_text)
-        offset += len(embed_dict["embed"]["description"])
-        offset += len(embed_dict["embed"]["title"])
-        if page_char_limit + offset > 5500:
-            page_char_limit = 5500 - offset
-        elif page_char_limit < 250:
-            page_char_limit = 250
-
-        field_groups = self.group_embed_fields(embed_dict["fields"], page_char_limit)
-
-        color = await ctx.embed_color()
-        page_count = len(field_groups)
-
-        if not field_groups:  # This can happen on single command without a docstring
-            embed = discord.Embed(color=color, **embed_dict["embed"])
-            embed.set_author(**author_info)
-            embed.set_footer(**embed_dict["footer"])
-            if thumbnail_url:
-                embed.set_thumbnail(url=thumbnail_url)
-            pages.append(embed)
-
-        for i, group in enumerate(field_groups, 1):
-            embed = discord.Embed(color=color, **embed_dict["embed"])
-
-            if page_count > 1:
-                description = _("Page {page_num} of {page_count}\n{content_description}").format(
-                    content_description=embed.description,
-                    page_num=i,
-                    page_count=page_count,
-                )
-                embed.description = description
-
-            embed.set_author(**author_info)
 
-            for field in group:
-                embed.add_field(**field._asdict())
+        with HELP_STATS.timer("make_embeds"):
+            field_groups = pack_embed_fields(
+                embed_dict["fields"],
+                max(help_settings.page_char_limit, 250),
+                lambda page_count: embed_overhead(embed_dict, author_info["name"], page_count),
+            )
 
-            embed.set_footer(**embed_dict["footer"])
-            if thumbnail_url:
-                embed.set_thumbnail(url=thumbnail_url)
-            pages.append(embed)
-
-        return pages
+        color = (await self.help_context(ctx)).embed_color
+        return EmbedPages(embed_dict, field_groups, color, author_info, thumbnail_url)
 
     async def send_pages(
         self,
         ctx: Context,
-        pages: List[Union[str, discord.Embed]],
+        pages: Sequence[Union[str, discord.Embed]],
         embed: bool = True,
         page_mapping: Dict[Category, List] = {},
         *,
         help_settings: HelpSettings,
+        target: Optional[str] = None,
     ):
         """
         Sends pages based on settings.
         If page_mapping is non-empty, then it's the main help menu and we need to add the home button
+        target is the persistent_target of the pages, persistent menus need it
         """
 
+        # Called by the formatters from render, keep the pages instead of sending them
+        capture = _render_capture.get()
+        if capture is not None and capture.rendered is None:
+            capture.rendered = CachedRender(pages, embed, dict(page_mapping))
+            self.render_cache.put(capture.key, capture.rendered, capture.tags)
+            return
+        await self._send_pages(
+            ctx, pages, page_mapping, help_settings=help_settings, target=target
+        )
+
+    @timed("send")
+    async def _send_pages(
+        self,
+        ctx: Context,
+        pages: Sequence[Union[str, discord.Embed]],
+        page_mapping: Dict[Category, List],
+        *,
+        help_settings: HelpSettings,
+        target: Optional[str],
+    ):
         # save on config calls
         channel_permissions = ctx.channel.permissions_for(ctx.me)
 
@@ -474,22 +1279,33 @@ class BaguetteHelp(commands.RedHelpFormatter):
             destination = ctx.author if use_DMs else ctx.channel
             delete_delay = help_settings.delete_delay
             messages: List[discord.Message] = []
-            for page in pages:
-                # TODO use the embed:bool on the function argument cause isinstance is costly
-                page_kwarg_dict = (
-                    {"embed": page} if isinstance(page, discord.Embed) else {"content": page}
-                )
-                try:
-                    msg = await destination.send(**page_kwarg_dict)
-                except discord.Forbidden:
-                    return await ctx.send(
-                        _(
-                            "I couldn't send the help message to you in DM. "
-                            "Either you blocked me or you disabled DMs in this server."
-                        )
+            try:
+                for page_kwarg_dict, packed in self.pack_pages(pages):
+                    try:
+                        messages.append(await destination.send(**page_kwarg_dict))
+                    except discord.Forbidden:
+                        raise
+                    except discord.HTTPException:
+                        if len(packed) == 1:
+                            raise
+                        # Discord didn't like the packed message, one page per message then
+                        for page in packed:
+                            page_kwarg_dict = (
+                                {"embed": page}
+                                if isinstance(page, discord.Embed)
+                                else {"content": page}
+                            )
+                            messages.append(await destination.send(**page_kwarg_dict))
+            except discord.Forbidden:
+                return await ctx.send(
+                    _(
+                        "I couldn't send the help message to you in DM. "
+                        "Either you blocked me or you disabled DMs in this server."
                     )
-                else:
-                    messages.append(msg)
+                )
+            if saved := len(pages) - len(messages):
+                self.api_calls_saved += saved
+                LOG.debug("Sent %s help pages in %s messages", len(pages), len(messages))
             if use_DMs and help_settings.use_tick:
                 await ctx.tick()
             # The if statement takes into account that 'destination' will be
@@ -512,33 +1328,313 @@ class BaguetteHelp(commands.RedHelpFormatter):
 
                 asyncio.create_task(_delete_delay_help(destination, messages, delete_delay))
         else:
-            menu = HybridMenus(self.settings, help_settings, page_mapping, pages)
+            if (
+                self.settings["persistent"]
+                and target is not None
+                and "emojis" not in (self.settings["menutype"], self.settings["arrowtype"])
+                and await self.persistent_menus.send(ctx, pages, page_mapping, target)
+            ):
+                return
+            # Same user in the same channel, show it on the menu they already have
+            key = (ctx.channel.id, ctx.author.id)
+            if (menu := self.live_menus.get(key)) and await menu.retarget(
+                ctx, pages, dict(page_mapping), help_settings
+            ):
+                return
+            # The menu mutates its mapping, and this one might be shared with the render cache
+            menu = HybridMenus(self.settings, help_settings, dict(page_mapping), pages)
             await menu.start(ctx)
+            if menu.is_live():
+                self.live_menus.add(key, menu)
+
+    @staticmethod
+    def pack_pages(pages: Sequence[Union[str, discord.Embed]]):
+        """Yields (send kwargs, pages in it), as many pages per message as discord allows
+        That's 10 embeds and 6000 characters worth of embeds, or 2000 characters of text"""
+        packed: List[Any] = []
+        size = 0
+
+        def message():
+            if isinstance(packed[0], discord.Embed):
+                return {"embeds": packed}, packed
+            return {"content": "\n".join(packed)}, packed
+
+        for page in pages:
+            if isinstance(page, discord.Embed):
+                page_size = len(page)
+                full = len(packed) == 10 or size + page_size > 6000
+            else:
+                page_size = len(page) + 1  # joined with newlines
+                full = size + page_size > 2001
+            if packed and (
+                full or isinstance(page, discord.Embed) != isinstance(packed[0], discord.Embed)
+            ):
+                yield message()
+                packed, size = [], 0
+            packed.append(page)
+            size += page_size
+        if packed:
+            yield message()
 
     async def blacklist(self, ctx, name) -> bool:
         """Some blacklist checks utils
         Returns true if needed to be shown"""
-        blocklist = self.blacklist_names
-        a = (
-            ctx.channel.is_nsfw() if hasattr(ctx.channel, "is_nsfw") else True
-        ) or name not in blocklist["nsfw"]
-
-        b = await self.bot.is_owner(ctx.author) or name not in blocklist["dev"]
-        return a and b
+        return (await self.help_context(ctx)).can_see_category(name)
 
     async def filter_categories(self, ctx, categories: Iterable) -> list:
         """Applies blacklist to all the categories, Filters based on the current context"""
-        blocklist = self.blacklist_names
-        is_owner = await self.bot.is_owner(ctx.author)
-        final = []
-        for name in categories:
-            # This condition is made using a simple kmap.
-            if (
-                (ctx.channel.is_nsfw() if hasattr(ctx.channel, "is_nsfw") else True)
-                or name not in blocklist["nsfw"]
-            ) and (is_owner or name not in blocklist["dev"]):
-                final.append(name)
-        return final
+        hctx = await self.help_context(ctx)
+        return [category for category in categories if hctx.can_see_category(category)]
+
+
+class PersistentMenus:
+    """Help menus that keep working forever, even across restarts
+
+    Nothing is kept in memory, the components carry the whole menu state in their custom_id
+    and clicks re-render the pages through the render cache. Buttons and select menus only."""
+
+    ARROW_SLOTS = ("force_left", "left", "right", "force_right")
+
+    def __init__(self, formatter: BaguetteHelp):
+        self.formatter = formatter
+
+    def build_view(
+        self, state: PersistentState, page_count: int, categories: Iterable[Category]
+    ) -> discord.ui.View:
+        """The components for a page, raises ValueError if a custom_id would be too long"""
+        settings = self.formatter.settings
+        view = discord.ui.View(timeout=None)
+
+        def custom_id(**changes):
+            value = state._replace(**changes).custom_id()
+            if len(value) > 100:
+                raise ValueError(value)
+            return value
+
+        category_bar = None
+        if state.from_home:
+            if settings["menutype"] == "buttons":
+                for cat in categories:
+                    if cat.reaction or cat.label:
+                        view.add_item(
+                            discord.ui.Button(
+                                emoji=cat.reaction,
+                                style=getattr(discord.ButtonStyle, cat.style),
+                                label=cat.label,
+                                custom_id=custom_id(page=0, slot="c", target="k:" + cat.name),
+                            )
+                        )
+            elif settings["menutype"] == "select":
+                category_bar = discord.ui.Select(
+                    custom_id=custom_id(slot="s"),
+                    placeholder="Select a category...",
+                    row=0,
+                )
+                for cat in categories:
+                    category_bar.add_option(
+                        label=cat.name,
+                        description=None if cat.desc == "Not provided" else cat.desc,
+                        emoji=cat.reaction,
+                    )
+
+        if settings["arrowtype"] == "buttons":
+            if state.from_home:
+                if category_bar is not None:
+                    category_bar.add_option(
+                        label="Home", description="Go to the main page", emoji=ARROWS["home"].emoji
+                    )
+                else:
+                    home_style = Counter([arrow.style for arrow in ARROWS]).most_common(1)[0][0]
+                    view.add_item(
+                        discord.ui.Button(
+                            emoji=ARROWS["home"].emoji,
+                            style=home_style,
+                            custom_id=custom_id(slot="home"),
+                            row=3 if settings["menutype"] != "buttons" else None,
+                        )
+                    )
+            if settings["nav"]:
+                if page_count == 1:
+                    view.add_item(
+                        discord.ui.Button(
+                            **ARROWS["cross"].items(), custom_id=custom_id(slot="cross")
+                        )
+                    )
+                else:
+                    for arrow in ARROWS:
+                        if arrow.name != "home":
+                            view.add_item(
+                                discord.ui.Button(
+                                    **arrow.items(), custom_id=custom_id(slot=arrow.name), row=4
+                                )
+                            )
+        elif settings["arrowtype"] == "select":
+            arrow_bar = discord.ui.Select(
+                custom_id=custom_id(slot="a"), placeholder="Select an arrow..."
+            )
+            if settings["nav"]:
+                for arrow in ARROWS:
+                    if arrow.name != "home":
+                        arrow_bar.add_option(label=arrow.name, emoji=arrow.emoji)
+            if state.from_home:
+                arrow_bar.add_option(
+                    label="Home", description="Return to the main page", emoji=ARROWS["home"].emoji
+                )
+            if arrow_bar.options:
+                view.add_item(arrow_bar)
+
+        if category_bar is not None and category_bar.options:
+            view.add_item(category_bar)
+        # Nothing to listen for, dpy won't store a finished view. on_interaction handles the clicks
+        view.stop()
+        return view
+
+    async def send(
+        self, ctx: Context, pages, page_mapping: Dict[Category, List], target: str
+    ) -> bool:
+        """Sends the first page, False if the state doesn't fit in the components"""
+        state = PersistentState(ctx.author.id, bool(page_mapping), 0, "", target)
+        try:
+            view = self.build_view(state, len(pages), page_mapping)
+        except ValueError:
+            return False
+
+        kwargs = HybridMenus._get_kwargs_from_page(pages[0])
+        if self.formatter.settings["replies"]:
+            kwargs["reference"] = ctx.message.to_reference(fail_if_not_exists=False)
+            kwargs["mention_author"] = False
+        await ctx.send(**kwargs, view=view)
+        return True
+
+    async def get_context(self, interaction: discord.Interaction, requester: int) -> Context:
+        """Rebuilds a help invocation of the requester from the menu message"""
+        bot = interaction.client
+        message = copy(interaction.message)
+        if interaction.user.id == requester:
+            message.author = interaction.user
+        else:  # Bot owners can use anyone's menu, but the pages stay the requester's
+            member = interaction.guild and interaction.guild.get_member(requester)
+            message.author = member or await bot.get_or_fetch_user(requester)
+        prefixes = await bot.get_valid_prefixes(interaction.guild)
+        message.content = f"{prefixes[0]}help"
+        return await bot.get_context(message)
+
+    async def render_target(
+        self, ctx: Context, target: str, help_settings: HelpSettings
+    ) -> Optional[CachedRender]:
+        kind, __, name = target.partition(":")
+        if kind == "h":
+            return await self.formatter.render(ctx, None, help_settings)
+        elif kind == "k":
+            help_for = get_category(name)
+        elif kind == "c":
+            help_for = ctx.bot.get_cog(name)
+        else:
+            try:
+                help_for = await self.formatter.parse_command(ctx, name)
+            except (NoCommand, NoSubCommand):
+                return None
+        # Gone since the menu was sent
+        if help_for is None:
+            return None
+        return await self.formatter.render(ctx, help_for, help_settings)
+
+    async def handle_interaction(self, interaction: discord.Interaction):
+        """Handles a click on any persistent help menu, ignores every other component"""
+        custom_id = (interaction.data or {}).get("custom_id", "")
+        if (state := PersistentState.from_custom_id(custom_id)) is not None:
+            await self._handle_interaction(interaction, state)
+
+    @timed("menu:persistent")
+    async def _handle_interaction(self, interaction: discord.Interaction, state: PersistentState):
+        if (
+            interaction.user.id != state.requester
+            and interaction.user.id not in interaction.client.owner_ids
+        ):
+            await interaction.response.send_message(
+                "You cannot use this help menu.", ephemeral=True
+            )
+            return
+        await interaction.response.defer()
+
+        slot, target, page = state.slot, state.target, state.page
+        values = interaction.data.get("values") or [None]
+        if slot == "a":
+            slot = values[0]
+        elif slot == "s":
+            slot = values[0] if values[0] == "Home" else "c"
+            target = "k:" + str(values[0])
+
+        if slot == "cross":
+            await interaction.delete_original_response()
+            return
+        if slot in ("home", "Home"):
+            target = "h:"
+        if slot not in self.ARROW_SLOTS:
+            page = 0
+
+        ctx = await self.get_context(interaction, state.requester)
+        help_settings = (await self.formatter.help_context(ctx)).help_settings
+        if not (rendered := await self.render_target(ctx, target, help_settings)):
+            return
+        pages = rendered.pages
+        page = {
+            "force_left": 0,
+            "left": page - 1,
+            "right": page + 1,
+            "force_right": len(pages) - 1,
+        }.get(slot, page) % len(pages)
+
+        categories = {}
+        if state.from_home:
+            home = (
+                rendered if target == "h:" else await self.render_target(ctx, "h:", help_settings)
+            )
+            categories = home.page_mapping if home else {}
+        try:
+            view = self.build_view(
+                state._replace(page=page, slot="", target=target), len(pages), categories
+            )
+        except ValueError:
+            view = None
+        await interaction.edit_original_response(
+            **HybridMenus._get_kwargs_from_page(pages[page]), view=view
+        )
+
+
+class MenuRegistry:
+    """The live help menu of every (channel_id, user_id)
+
+    Capped, the oldest menus are expired first when there are too many."""
+
+    def __init__(self, maxsize: int = 100):
+        self.maxsize = maxsize
+        self._menus: "OrderedDict[Tuple[int, int], HybridMenus]" = OrderedDict()
+
+    def get(self, key: Tuple[int, int]) -> Optional["HybridMenus"]:
+        if (menu := self._menus.get(key)) is None:
+            return None
+        if not menu.is_live():
+            del self._menus[key]
+            return None
+        self._menus.move_to_end(key)
+        return menu
+
+    def add(self, key: Tuple[int, int], menu: "HybridMenus"):
+        if (old := self._menus.pop(key, None)) is not None and old is not menu:
+            old.expire()
+        self._menus[key] = menu
+        while len(self._menus) > self.maxsize:
+            self._menus.popitem(last=False)[1].expire()
+
+    def prune(self):
+        """Drops the menus that timed out or were closed"""
+        for key in [key for key, menu in self._menus.items() if not menu.is_live()]:
+            del self._menus[key]
+
+    def __len__(self):
+        self.prune()
+        return len(self._menus)
 
 
 class HybridMenus:
@@ -557,17 +1653,59 @@ class HybridMenus:
 
         # Source specific
         self.curr_page = 0
-        self.pages: List[Union[str, discord.Embed]] = pages
+        self.pages: Sequence[Union[str, discord.Embed]] = pages
+        # { category_obj: pages or None if not rendered yet }
         self.category_page_mapping = page_mapping
+        self.home_pages = pages if page_mapping else None
         self.no_arrows_yet = False
+        # Arrow buttons per layout, "single" (just the cross) or "multi" (every arrow)
+        self.arrow_layouts: Dict[str, List[ArrowButton]] = {}
+        self.arrow_layout: Optional[str] = None
+
+    def get_arrow_buttons(self, layout: str) -> List[ArrowButton]:
+        """The arrow buttons of a layout, built once per view"""
+        if (buttons := self.arrow_layouts.get(layout)) is None:
+            if layout == "single":
+                arrow = ARROWS["cross"]
+                buttons = [ArrowButton(arrow.name, **arrow.items(), row=None)]
+            else:
+                buttons = [
+                    ArrowButton(arrow.name, **arrow.items())
+                    for arrow in ARROWS
+                    if arrow.name != "home"
+                ]
+            self.arrow_layouts[layout] = buttons
+        return buttons
+
+    def switch_arrow_layout(self, layout: str):
+        """Swaps the arrow buttons on the view for the ones of another layout
+
+        Only the buttons that differ are removed and added, the rest of the view stays"""
+        view_menu = self.menus[1]
+        new = self.get_arrow_buttons(layout)
+        if self.arrow_layout is not None:
+            for button in self.get_arrow_buttons(self.arrow_layout):
+                if button not in new:
+                    view_menu.remove_item(button)
+        for button in new:
+            if button not in view_menu.children:
+                view_menu.add_item(button)
+        self.arrow_layout = layout
 
     async def get_pages(self, ctx: commands.Context, category_name: str):
+        if category_name.lower() == "home":
+            if not self.home_pages:
+                rendered = await ctx.bot._help_formatter.render(ctx, None, self.help_settings)
+                self.home_pages = rendered.pages if rendered else []
+            return self.home_pages
+
+        # Category pages are rendered on the first click, then memoized for this menu
         if not (category_pages := self.category_page_mapping.get(category_name)):
-            if category_name.lower() == "home":
-                category_pages = await ctx.bot._help_formatter.format_bot_help(
-                    ctx, self.help_settings, get_pages=True
+            if category := get_category(category_name):
+                category_pages = await ctx.bot._help_formatter.get_category_pages(
+                    ctx, category, self.help_settings
                 )
-            self.category_page_mapping[category_name] = category_pages
+                self.category_page_mapping[category] = category_pages
 
         return category_pages
 
@@ -595,7 +1733,8 @@ class HybridMenus:
             await self.menus[1].start(ctx)
             self.bot_message = self.menus[1].message
 
-    def _get_kwargs_from_page(self, value):
+    @staticmethod
+    def _get_kwargs_from_page(value):
         kwargs: dict[str, Any] = {"allowed_mentions": discord.AllowedMentions(replied_user=False)}
         if isinstance(value, dict):
             kwargs.update(value)
@@ -617,7 +1756,7 @@ class HybridMenus:
             # Category buttons
             for cat, pages in self.category_page_mapping.items():
                 if cat.reaction:
-                    dpy_menu.add_button(await react_page(cat, pages))
+                    dpy_menu.add_reaction_button(await react_page(cat, pages), CATEGORY_PRIORITY)
             self.menus[0] = dpy_menu
         elif self.settings["menutype"] != "hidden":
             view_menu = BaseInteractionMenu(hmenu=self)
@@ -667,16 +1806,18 @@ class HybridMenus:
 
             if len(self.pages) == 1:
                 self.no_arrows_yet = True
-                dpy_menu.add_button(await arrow_react(ARROWS["cross"]))
+                dpy_menu.add_reaction_button(await arrow_react(ARROWS["cross"]), ARROW_PRIORITY)
             else:
                 for arrow in ARROWS:
                     if arrow.name == "home":
                         # Main page alone shows the home button
                         if self.category_page_mapping:
-                            dpy_menu.add_button(await home_react(arrow.emoji))
+                            dpy_menu.add_reaction_button(
+                                await home_react(arrow.emoji), HOME_PRIORITY
+                            )
                         continue
                     if self.settings["nav"]:  # Fix this later, crap inefficient code
-                        dpy_menu.add_button(await arrow_react(arrow))
+                        dpy_menu.add_reaction_button(await arrow_react(arrow), ARROW_PRIORITY)
 
         elif self.settings["arrowtype"] != "hidden":
             if not self.menus[1]:
@@ -709,29 +1850,12 @@ class HybridMenus:
                             )
                         )
 
-                class Button(discord.ui.Button):
-                    view: BaseInteractionMenu
-
-                    def __init__(self, name, row=4, **kwargs):
-                        self.name = name
-                        super().__init__(**kwargs, row=row)
-
-                    async def callback(self, interaction):
-                        await self.view.hmenu.arrow_emoji_button[self.name](interaction)
-
                 if self.settings["nav"]:
                     if len(self.pages) == 1:
                         self.no_arrows_yet = True
-                        arrow = ARROWS["cross"]
-                        button = Button(arrow.name, **arrow.items(), row=None)
-                        view_menu.add_item(button)
+                        self.switch_arrow_layout("single")
                     else:
-                        for arrow in ARROWS:
-                            if arrow.name == "home":
-                                continue
-                            # TODO remove subclass later (dont need a state for each button)
-                            button = Button(arrow.name, **arrow.items())
-                            view_menu.add_item(button)
+                        self.switch_arrow_layout("multi")
 
             else:  # Select
                 options = []
@@ -762,7 +1886,57 @@ class HybridMenus:
             if menu:
                 menu.stop()
 
+    def is_live(self) -> bool:
+        """Whether this menu can be retargeted, it needs a running view and no reactions"""
+        return (
+            self.menus[0] is None and self.menus[1] is not None and not self.menus[1].is_finished()
+        )
+
+    def expire(self):
+        """Stops the menu as if it timed out"""
+        if self.is_live():
+            view = self.menus[1]
+            view.stop()
+            asyncio.create_task(view.on_timeout())
+
+    async def retarget(
+        self, ctx, pages, page_mapping: Dict[Category, List], help_settings: HelpSettings
+    ) -> bool:
+        """Shows other help pages on this menu's message, with the components they need
+        Returns False if the menu is gone, a new one has to be started then"""
+        # Reactions can't be swapped around cheaply, the type might've been changed since
+        if not self.is_live() or "emojis" in (
+            self.settings["menutype"],
+            self.settings["arrowtype"],
+        ):
+            return False
+        old_view = self.menus[1]
+        old_view.stop()
+        self.menus = [None, None]
+        self.help_settings = help_settings
+        self.pages = pages
+        self.curr_page = 0
+        self.category_page_mapping = page_mapping
+        if page_mapping:
+            self.home_pages = pages
+        self.no_arrows_yet = False
+        # The buttons belong to the old view
+        self.arrow_layouts.clear()
+        self.arrow_layout = None
+
+        await self.create_menutype()
+        await self.create_arrowtype(ctx)
+        if self.menus[1]:
+            await self.menus[1].start(ctx, message=self.bot_message)
+        try:
+            await self.show_current_page(self.bot_message, view=self.menus[1])
+        except discord.NotFound:  # Deleted by someone else
+            self.stop()
+            return False
+        return True
+
     # MENU ACTIONS BLOCK #
+    @timed("menu:category")
     async def category_react_action(
         self, user_ctx: commands.Context, interaction, category_name: str
     ):
@@ -783,24 +1957,18 @@ class HybridMenus:
                             # home page already has cross
                             continue
                         if self.settings["nav"]:
-                            await self.menus[0].add_button(await arrow_react(arrow), react=True)
+                            self.menus[0].add_reaction_button(
+                                await arrow_react(arrow), ARROW_PRIORITY
+                            )
 
                 if self.settings["arrowtype"] == "buttons":
-                    # Buttons/select
-                    # We recreate the menu, so we can add the arrows
-                    sender_ctx = self.menus[1].ctx
-                    bot_message = self.menus[1].message
-
                     # This is needed for the interaction to not failed,
                     # when the category is a button
                     if type(interaction) == discord.Interaction:
                         await interaction.response.defer()
 
-                    self.menus[1].clear_items()
-
-                    await self.create_menutype()
-                    await self.create_arrowtype(sender_ctx)
-                    await self.menus[1].start(ctx=sender_ctx, message=bot_message)
+                    # The category components stay, only the cross gives way to the arrows
+                    self.switch_arrow_layout("multi")
 
                 if any(self.menus):
                     await self.show_current_page(self.bot_message, view=self.menus[1])
@@ -809,32 +1977,32 @@ class HybridMenus:
             else:
                 await self.show_current_page(interaction)
 
+    @timed("menu:home")
     async def home_page(self, ctx, interaction):
         self.change_source(await self.get_pages(ctx, "home"))
         await self.show_current_page(interaction)
 
+    @timed("menu:first")
     async def first_page(self, interaction):
         self.curr_page = 0
         await self.show_current_page(interaction)
 
+    @timed("menu:last")
     async def last_page(self, interaction):
         self.curr_page = len(self.pages) - 1
         await self.show_current_page(interaction)
 
+    @timed("menu:next")
     async def next_page(self, interaction):
-        if self.curr_page < len(self.pages) - 1:
-            self.curr_page += 1
-            await self.show_current_page(interaction)
-        else:
-            await self.first_page(interaction)
+        # Wraps around to the first page
+        self.curr_page = (self.curr_page + 1) % len(self.pages)
+        await self.show_current_page(interaction)
 
+    @timed("menu:prev")
     async def prev_page(self, interaction):
-        if self.curr_page > 0:
-            self.curr_page -= 1
-            await self.show_current_page(interaction)
-        else:
-            await self.last_page(interaction)
+        self.curr_page = (self.curr_page - 1) % len(self.pages)
+        await self.show_current_page(interaction)
 
     async def close_menu(self, interaction):
         self.stop()
-        await self.bot_message.delete()
\ No newline at end of file
+        await self.bot_message.delete()
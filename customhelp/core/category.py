@@ -53,10 +53,7 @@ class Arrow:
 def get_category(category: Optional[str]) -> Optional[Category]:
     if not category:
         return
-
-    for x in GLOBAL_CATEGORIES:
-        if x.name == category:
-            return x
+    return GLOBAL_CATEGORIES.find(category)
 
 
 class CategoryConvert(commands.Converter):
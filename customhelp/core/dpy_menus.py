@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, List, Optional, Union
+import heapq
+import logging
+import time
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import discord
 from redbot.core.bot import Red
@@ -11,6 +15,76 @@ import customhelp.core.base_help as base_help
 
 from . import ARROWS, GLOBAL_CATEGORIES
 
+LOG = logging.getLogger("red.customhelp.core.dpy_menus")
+
+# Reactions are added in this order, lower first
+ARROW_PRIORITY = 0
+HOME_PRIORITY = 1
+CATEGORY_PRIORITY = 2
+# Discord lets a bot add about one reaction per 0.25s in a channel
+REACTION_INTERVAL = 0.25
+
+# channel id -> when the next reaction can be added there
+_next_reaction: Dict[int, float] = {}
+# (channel id, user id) -> the reactions of the latest emoji menu of that user
+_schedulers: Dict[Tuple[int, int], "ReactionScheduler"] = {}
+
+
+class ReactionScheduler:
+    """Adds the reactions of a menu in the background, most important first
+
+    The menu listens for reactions before any is added, so early clicks work. Adds are
+    paced to the reaction rate limit of the channel, and the rest is dropped once the menu
+    stops or the user opens another help menu in the same channel."""
+
+    def __init__(self, menu: "BaseMenu"):
+        self.menu = menu
+        self._queue: List[Tuple[int, int, Any]] = []  # heap of (priority, order, emoji)
+        self._order = count()
+        self._task: Optional[asyncio.Task] = None
+        self._key: Optional[Tuple[int, int]] = None
+
+    def schedule(self, emoji, priority: int):
+        heapq.heappush(self._queue, (priority, next(self._order), emoji))
+        if self._key is not None and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    def start(self, ctx):
+        self._key = (self.menu.message.channel.id, ctx.author.id)
+        if (old := _schedulers.get(self._key)) is not None:
+            # The user moved on to another menu, the old one doesn't need its reactions
+            old.cancel()
+        _schedulers[self._key] = self
+        if self._queue:
+            self._task = asyncio.create_task(self._run())
+
+    def cancel(self):
+        self._queue.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        if _schedulers.get(self._key) is self:
+            del _schedulers[self._key]
+
+    async def _run(self):
+        channel_id = self._key[0]
+        while self._queue:
+            __, __, emoji = heapq.heappop(self._queue)
+            # Reserve the slot before sleeping, so menus in the same channel queue up behind it
+            now = time.monotonic()
+            slot = max(_next_reaction.get(channel_id, 0), now)
+            _next_reaction[channel_id] = slot + REACTION_INTERVAL
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            try:
+                await self.menu.message.add_reaction(emoji)
+            except discord.NotFound:  # the menu got deleted
+                self.cancel()
+                return
+            except discord.HTTPException:
+                LOG.debug("Couldn't add the %s reaction to a help menu", emoji, exc_info=True)
+        if _next_reaction.get(channel_id, 0) <= time.monotonic():
+            _next_reaction.pop(channel_id, None)
+
 
 class BaseMenu(menus.Menu):
     def __init__(
@@ -22,6 +96,7 @@ class BaseMenu(menus.Menu):
         super().__init__(message=message, timeout=hmenu.settings["timeout"])
         self.use_reply = hmenu.settings["replies"]
         self.hmenu = hmenu
+        self.reactions = ReactionScheduler(self)
 
         self.message: discord.Message
         self.bot: Red
@@ -35,10 +110,28 @@ class BaseMenu(menus.Menu):
             )  # sends message silently when message is deleted
         return await ctx.send(**kwargs, view=self.hmenu.menus[1])
 
+    def add_reaction_button(self, button: menus.Button, priority: int):
+        """Registers the button right away, its reaction gets added by the scheduler"""
+        self.add_button(button)
+        self.reactions.schedule(button.emoji, priority)
+
     async def start(self, ctx, channel=None, wait=False):
         await super().start(ctx, channel=channel, wait=wait)
+        # menus.Menu queued a task adding every reaction one by one, the scheduler does that
+        # instead. The task hasn't had a chance to run yet, so cancelling it is enough.
+        tasks = getattr(self, "_Menu__tasks", [])
+        if not wait and len(tasks) == 2:
+            tasks.pop().cancel()
+        self.reactions.start(ctx)
         return self.message
 
+    def stop(self):
+        self.reactions.cancel()
+        super().stop()
+
+    async def finalize(self, timed_out):
+        self.reactions.cancel()
+
     def reaction_check(self, payload):
         """Just extends the default reaction_check to use owner_ids"""
         if payload.message_id != self.message.id:
@@ -0,0 +1,183 @@
+import asyncio
+import re
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from difflib import get_close_matches
+from typing import Dict, List, Optional, Set, Tuple
+
+from redbot.core import commands
+
+from . import GLOBAL_CATEGORIES
+
+TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+
+# How much a match in each part of a command counts
+NAME_WEIGHT = 5.0
+ALIAS_WEIGHT = 4.0
+COG_WEIGHT = 3.0
+CATEGORY_WEIGHT = 3.0
+SHORTDOC_WEIGHT = 2.0
+LONGDOC_WEIGHT = 1.0
+# Partial matches count for less than exact ones
+PREFIX_FACTOR = 0.8
+TYPO_FACTOR = 0.6
+# Terms whose close matches are remembered, the least recently searched go first
+TYPO_CACHE_SIZE = 512
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_REGEX.findall(text.lower()) if text else []
+
+
+class SearchIndex:
+    """Inverted index over the help of every command, token -> {command: weight}
+
+    Built on the first search or by the pre-warm, and patched on cog add/remove. Category
+    edits rebuild it lazily. Unknown terms fall back to prefix matches, then to close matches
+    for typos."""
+
+    def __init__(self):
+        self._postings: Optional[Dict[str, Dict[commands.Command, float]]] = None
+        self._tokens: Dict[commands.Command, Set[str]] = {}
+        self._vocabulary: Optional[List[str]] = None  # sorted, for prefix matches
+        self._typos: "OrderedDict[str, List[str]]" = OrderedDict()
+        # Bumped on every change, so build_async knows when its snapshot went stale
+        self._generation = 0
+
+    def build(self, bot):
+        if self._postings is None:
+            self._postings = defaultdict(dict)
+            self._tokens.clear()
+            for command in bot.walk_commands():
+                self._add(command)
+
+    async def build_async(self, bot, batch: int = 100):
+        """build, letting the event loop run every `batch` commands
+
+        Works on a snapshot of the commands, it's thrown away if cogs changed meanwhile and
+        the next search builds the index again."""
+        if self._postings is not None:
+            return
+        generation = self._generation
+        postings: Dict[str, Dict[commands.Command, float]] = defaultdict(dict)
+        tokens: Dict[commands.Command, Set[str]] = {}
+        for count, command in enumerate(list(bot.walk_commands()), 1):
+            weights = self._weights(command)
+            for token, weight in weights.items():
+                postings[token][command] = weight
+            tokens[command] = set(weights)
+            if count % batch == 0:
+                await asyncio.sleep(0)
+        if self._postings is None and self._generation == generation:
+            self._postings, self._tokens = postings, tokens
+            self._changed()
+
+    def _changed(self):
+        self._vocabulary = None
+        self._typos.clear()
+
+    def _add(self, command: commands.Command):
+        weights = self._weights(command)
+        for token, weight in weights.items():
+            self._postings[token][command] = weight
+        self._tokens[command] = set(weights)
+
+    @staticmethod
+    def _weights(command: commands.Command) -> Dict[str, float]:
+        """Tokens of the command, with how much the best match of each counts"""
+        weights: Dict[str, float] = {}
+
+        def feed(text, weight):
+            for token in tokenize(text):
+                if weights.get(token, 0) < weight:
+                    weights[token] = weight
+
+        feed(command.qualified_name, NAME_WEIGHT)
+        for alias in command.aliases:
+            feed(alias, ALIAS_WEIGHT)
+        if command.cog is not None:
+            feed(command.cog.qualified_name, COG_WEIGHT)
+            category = GLOBAL_CATEGORIES.category_of(command.cog.__class__.__name__)
+        elif GLOBAL_CATEGORIES:
+            category = GLOBAL_CATEGORIES.uncategorised
+        else:
+            category = None
+        if category is not None:
+            feed(category.name, CATEGORY_WEIGHT)
+        feed(command.short_doc, SHORTDOC_WEIGHT)
+        feed(command.help, LONGDOC_WEIGHT)
+        return weights
+
+    def _remove(self, command: commands.Command):
+        for token in self._tokens.pop(command, ()):
+            postings = self._postings[token]
+            postings.pop(command, None)
+            if not postings:
+                del self._postings[token]
+
+    def add_cog(self, cog: commands.Cog):
+        self._generation += 1
+        if self._postings is not None:
+            for command in cog.walk_commands():
+                self._add(command)
+            self._changed()
+
+    def remove_cog(self, cog: commands.Cog):
+        self._generation += 1
+        if self._postings is not None:
+            for command in [command for command in self._tokens if command.cog is cog]:
+                self._remove(command)
+            self._changed()
+
+    def invalidate(self):
+        self._generation += 1
+        self._postings = None
+        self._changed()
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Index tokens the term stands for, with how much each counts"""
+        if term in self._postings:
+            return [(term, 1.0)]
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        matches = []
+        if len(term) >= 3:
+            start = bisect_left(self._vocabulary, term)
+            for token in self._vocabulary[start:]:
+                if not token.startswith(term):
+                    break
+                matches.append((token, PREFIX_FACTOR))
+        if not matches:
+            if (typos := self._typos.get(term)) is None:
+                typos = self._typos[term] = get_close_matches(
+                    term, self._vocabulary, n=3, cutoff=0.75
+                )
+                if len(self._typos) > TYPO_CACHE_SIZE:
+                    self._typos.popitem(last=False)
+            else:
+                self._typos.move_to_end(term)
+            matches = [(token, TYPO_FACTOR) for token in typos]
+        return matches
+
+    def search(self, bot, query: str) -> List[commands.Command]:
+        """Commands matching the query, best first
+
+        Commands matching more of the terms come first, then the higher scores"""
+        self.build(bot)
+        scores: Dict[commands.Command, float] = defaultdict(float)
+        hits: Dict[commands.Command, int] = defaultdict(int)
+        for term in dict.fromkeys(tokenize(query)):
+            best: Dict[commands.Command, float] = {}
+            for token, factor in self._expand(term):
+                for command, weight in self._postings[token].items():
+                    if best.get(command, 0) < weight * factor:
+                        best[command] = weight * factor
+            for command, score in best.items():
+                scores[command] += score
+                hits[command] += 1
+        return sorted(
+            scores, key=lambda command: (-hits[command], -scores[command], command.qualified_name)
+        )
+
+    def __len__(self):
+        return len(self._tokens)
@@ -0,0 +1,73 @@
+import time
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+# Samples kept per (phase, theme), older ones are dropped
+WINDOW = 512
+
+
+class Histogram:
+    """The last `size` timings of something, plus how many there were in total"""
+
+    __slots__ = ("samples", "count")
+
+    def __init__(self, size: int = WINDOW):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, value: float):
+        self.samples.append(value)
+        self.count += 1
+
+    def percentiles(self, *pcts: int) -> List[float]:
+        data = sorted(self.samples)
+        if not data:
+            return [0.0 for __ in pcts]
+        return [data[min(len(data) - 1, len(data) * pct // 100)] for pct in pcts]
+
+
+class Timer:
+    __slots__ = ("stats", "key", "start")
+
+    def __init__(self, stats: "HelpStats", key: Tuple[str, str]):
+        self.stats = stats
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.record(self.key, time.perf_counter() - self.start)
+        return False
+
+
+class HelpStats:
+    """Where the help time goes, per phase and theme
+
+    Meant to stay on: a timing is two perf_counter calls and a deque append."""
+
+    def __init__(self, size: int = WINDOW):
+        self.size = size
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.since = time.time()
+
+    def timer(self, phase: str, theme: str = "-") -> Timer:
+        """with stats.timer("render", "dank"): ..."""
+        return Timer(self, (phase, theme))
+
+    def record(self, key: Tuple[str, str], seconds: float):
+        if (histogram := self.histograms.get(key)) is None:
+            histogram = self.histograms[key] = Histogram(self.size)
+        histogram.add(seconds * 1000)
+
+    def rows(self) -> List[Tuple[str, str, int, float, float, float]]:
+        """(phase, theme, count, p50, p95, p99) with the timings in ms"""
+        return [
+            (phase, theme, histogram.count, *histogram.percentiles(50, 95, 99))
+            for (phase, theme), histogram in sorted(self.histograms.items())
+        ]
+
+    def clear(self):
+        self.histograms.clear()
+        self.since = time.time()
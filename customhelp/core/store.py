@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, suppress
+from copy import deepcopy
+from typing import Callable, Dict, List, Optional, Set
+
+from .category import Category
+
+LOG = logging.getLogger("red.customhelp.core.store")
+
+
+class CategoryStore:
+    """The configured categories, edited in memory and written to config in the background
+
+    data is the list of category dicts, exactly as it's saved in config. Edits are made on a
+    copy inside transaction() and only replace data if the block finishes and the result is
+    valid. Writes are debounced, a burst of edits ends up as a single config write."""
+
+    def __init__(self, value, on_change: Callable[[List[dict], List[dict]], None], delay=2.0):
+        self.value = value  # config.categories
+        self.on_change = on_change
+        self.delay = delay
+        self.data: List[dict] = []
+        self.writes = 0
+        self._lock = asyncio.Lock()
+        self._dirty = False
+        self._last_edit = 0.0
+        self._writer: Optional[asyncio.Task] = None
+        self._cog_index: Optional[Dict[str, dict]] = None
+
+    async def load(self):
+        """Re-read the categories from config, pending edits are written out first"""
+        await self.flush()
+        data = await self.value()
+        if self.ensure_uncategorised(data):
+            await self.value.set(data)
+        self.data = data
+        self._cog_index = None
+
+    def category_of(self, cog_name: str) -> Optional[dict]:
+        """The category the cog is configured in, loaded or not"""
+        if self._cog_index is None:
+            self._cog_index = {cog: category for category in self.data for cog in category["cogs"]}
+        return self._cog_index.get(cog_name)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Yields a copy of the categories to edit, discarded if the block raises"""
+        async with self._lock:
+            working = deepcopy(self.data)
+            yield working
+            self.ensure_uncategorised(working)
+            # Only what this edit broke, so old configs with quirks can still be edited
+            if problems := self.problems(working) - self.problems(self.data):
+                raise ValueError("\n".join(sorted(problems)))
+            if working == self.data:
+                return
+            old, self.data = self.data, working
+            self._cog_index = None
+            self.schedule_write()
+            self.on_change(old, working)
+
+    @staticmethod
+    def ensure_uncategorised(categories: List[dict]) -> bool:
+        """Adds the uncategorised placeholder if it's missing, returns whether it was added"""
+        if any(category.get("is_uncat") for category in categories):
+            return False
+        categories.append(
+            Category(
+                name="uncategorised", desc="Miscellaneous cogs", cogs=[], is_uncat=True
+            ).to_dict()
+        )
+        return True
+
+    @staticmethod
+    def problems(categories: List[dict]) -> Set[str]:
+        problems = set()
+        names = set()
+        owners: Dict[str, str] = {}
+        for category in categories:
+            name = category["name"]
+            if name in names:
+                problems.add(f"Duplicate category: {name}")
+            names.add(name)
+            if " " in name:
+                problems.add(f"Category names can't have spaces: {name}")
+            for cog_name in category["cogs"]:
+                if cog_name in owners and owners[cog_name] != name:
+                    problems.add(f"{cog_name} is in both {owners[cog_name]} and {name}")
+                owners[cog_name] = name
+        if sum(1 for category in categories if category.get("is_uncat")) != 1:
+            problems.add("There must be exactly one uncategorised category")
+        return problems
+
+    def schedule_write(self):
+        self._dirty = True
+        self._last_edit = time.monotonic()
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_later())
+
+    async def _write_later(self):
+        while self._dirty:
+            # Wait for the edits to settle down
+            while (remaining := self._last_edit + self.delay - time.monotonic()) > 0:
+                await asyncio.sleep(remaining)
+            try:
+                await self._write()
+            except Exception:
+                LOG.exception("Failed to save the categories, retrying with the next edit")
+                return
+
+    async def _write(self):
+        data = self.data
+        await self.value.set(deepcopy(data))
+        self.writes += 1
+        # Edits made while writing are picked up by the next write
+        if self.data is data:
+            self._dirty = False
+
+    async def flush(self):
+        """Writes pending edits right away"""
+        if self._writer is not None and not self._writer.done():
+            self._writer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._writer
+        if self._dirty:
+            await self._write()
+
+    def discard(self):
+        """Drops pending edits, for when config is about to be cleared"""
+        if self._writer is not None:
+            self._writer.cancel()
+        self._dirty = False
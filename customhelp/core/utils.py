@@ -1,10 +1,20 @@
 # This contains a bunch of utils
 
+import json
+import logging
+import os
 import re
-from typing import Optional
+import weakref
+from functools import lru_cache
+from inspect import getfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
+from redbot.core.i18n import get_locale
 from redbot.core.utils.chat_formatting import humanize_timedelta
 
+LOG = logging.getLogger("red.customhelp.core.utils")
+
 # From dpy server >.<
 EMOJI_REGEX = r"<(?P<animated>a?):(?P<name>[a-zA-Z0-9_]{2,32}):(?P<id>[0-9]{18,22})>"
 # https://www.w3resource.com/python-exercises/re/python-re-exercise-42.php
@@ -23,6 +33,7 @@ def emoji_converter(bot, emoji) -> Optional[str]:
 
 
 # Taken from the core help as well :)
+@lru_cache(maxsize=4096)
 def shorten_line(a_line: str, thbnail=False) -> str:
     # TODO for now if thumbnail is present,
     # we'll just return the line as is
@@ -79,6 +90,58 @@ def get_cooldowns(command):
     return cooldowns
 
 
+class CommandMetadata:
+    """What the help pages need from a command, computed once per command and context
+
+    Has qualified_name and signature, so it can be used in place of the command
+    when formatting the syntax strings."""
+
+    __slots__ = (
+        "qualified_name",
+        "signature",
+        "shortdoc",
+        "perms",
+        "cooldowns",
+        "thbnail",
+        "_lines",
+    )
+
+    def __init__(self, ctx, command, thbnail: bool):
+        self.qualified_name: str = command.qualified_name
+        self.signature: str = command.signature
+        self.shortdoc: str = command.format_shortdoc_for_context(ctx)
+        self.perms: str = get_perms(command)
+        self.cooldowns: List[str] = get_cooldowns(command)
+        self.thbnail = thbnail
+        self._lines: Dict[Tuple[str, int], str] = {}
+
+    def line(self, name: str, spacing: int) -> str:
+        """The shortened `name:`shortdoc line"""
+        if (line := self._lines.get((name, spacing))) is None:
+            line = self._lines[(name, spacing)] = shorten_line(
+                f"`{name:<{spacing}}:`{self.shortdoc}", self.thbnail
+            )
+        return line
+
+
+# command -> {(thumbnail, locale, prefix, bot name): metadata}, reloaded cogs make new commands
+_COMMAND_METADATA: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_command_metadata(ctx, command, thbnail=False) -> CommandMetadata:
+    # the shortdoc has [p] and [botname] replaced, hence the prefix and name in the key
+    key = (bool(thbnail), get_locale(), ctx.clean_prefix, ctx.me.display_name)
+    per_command = _COMMAND_METADATA.setdefault(command, {})
+    if (metadata := per_command.get(key)) is None:
+        metadata = per_command[key] = CommandMetadata(ctx, command, bool(thbnail))
+    return metadata
+
+
+def clear_command_metadata():
+    _COMMAND_METADATA.clear()
+    shorten_line.cache_clear()
+
+
 # Add aliases
 def get_aliases(command, original):
     if alias := list(command.aliases):
@@ -88,14 +151,37 @@ def get_aliases(command, original):
         return alias
 
 
-async def get_category_page_mapper_chunk(
-    formatter, get_pages, ctx, cat, help_settings, page_mapping
-):
-    if not get_pages:
-        if cat_page := await formatter.format_category_help(
-            ctx, cat, help_settings=help_settings, get_pages=True
-        ):
-            page_mapping[cat] = cat_page
-        else:
-            return False
-    return True
+async def get_category_page_mapper_chunk(formatter, ctx, cat, help_settings, page_mapping):
+    """Decides if the category is listed on the home page.
+
+    Only a cheap visibility probe is done here, the category pages are rendered lazily
+    by HybridMenus when the category is first clicked."""
+    if await formatter.category_has_visible_commands(ctx, cat, help_settings):
+        page_mapping[cat] = None
+        return True
+    return False
+
+
+def read_cog_tags(cog_classes: Dict[str, type], cache: Dict[str, Tuple[int, List[str]]]):
+    """Tags of every cog from its info.json, blocking so run this in a thread
+
+    cache is info.json path -> (mtime, tags), files that didn't change since are not read again"""
+    data: Dict[str, List[str]] = {}
+    for cog_name, cog_class in cog_classes.items():
+        try:
+            check = str(Path(getfile(cog_class)).parent / "info.json")
+            mtime = os.stat(check).st_mtime_ns
+        except (OSError, TypeError):  # no info.json, or a cog without a file
+            data[cog_name] = []
+            continue
+        if (cached := cache.get(check)) is None or cached[0] != mtime:
+            try:
+                with open(check, "r", encoding="utf-8") as f:
+                    tmp = json.load(f)
+                tags = [i.lower() for i in tmp["tags"]] if "tags" in tmp else []
+            except (OSError, ValueError, TypeError, AttributeError):
+                LOG.warning("Invalid info.json in cog %s", cog_name)
+                tags = []
+            cached = cache[check] = (mtime, tags)
+        data[cog_name] = cached[1]
+    return data
@@ -1,6 +1,6 @@
 import enum
 import logging
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, List, NamedTuple, Optional
 
 import discord
 from redbot.core import commands
@@ -11,6 +11,36 @@ if TYPE_CHECKING:
 LOG = logging.getLogger("red.customhelp.core.views")
 
 
+PERSISTENT_PREFIX = "chelp"
+
+
+class PersistentState(NamedTuple):
+    """Everything a persistent help menu needs, packed in the custom_id of its components
+
+    target is "h:" for the main page, "k:<category>", "c:<cog>" or "m:<command>"
+    slot is what the component does, an arrow name, "c" (category button), "s" (category select)
+    or "a" (arrow select)"""
+
+    requester: int
+    from_home: bool
+    page: int
+    slot: str
+    target: str
+
+    def custom_id(self) -> str:
+        return f"{PERSISTENT_PREFIX}:{self.requester}:{int(self.from_home)}:{self.page}:{self.slot}:{self.target}"
+
+    @classmethod
+    def from_custom_id(cls, custom_id: str) -> Optional["PersistentState"]:
+        parts = custom_id.split(":", 5)
+        if len(parts) != 6 or parts[0] != PERSISTENT_PREFIX:
+            return None
+        try:
+            return cls(int(parts[1]), parts[2] == "1", int(parts[3]), parts[4], parts[5])
+        except ValueError:
+            return None
+
+
 class ComponentType(enum.IntEnum):
     MENU = 0
     ARROW = 1
@@ -158,6 +188,17 @@ class ReactButton(discord.ui.Button):
         await self.view.hmenu.category_react_action(self.view.ctx, interaction, self.custom_id)
 
 
+class ArrowButton(discord.ui.Button):
+    view: BaseInteractionMenu
+
+    def __init__(self, name, row=4, **kwargs):
+        self.name = name
+        super().__init__(**kwargs, row=row)
+
+    async def callback(self, interaction: discord.Interaction):
+        await self.view.hmenu.arrow_emoji_button[self.name](interaction)
+
+
 # Selection Bar
 class SelectMenuHelpBar(discord.ui.Select):
     view: BaseInteractionMenu
@@ -1,14 +1,11 @@
 ﻿# pyright: reportGeneralTypeIssues=false
 import asyncio
-import json
+import logging
 import re
 from collections import Counter, defaultdict
-from inspect import getfile
 from itertools import chain
-from os import path
-from pathlib import Path
 from types import MethodType
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import discord
 import yaml
@@ -20,12 +17,15 @@ from redbot.core.utils.chat_formatting import box, pagify
 from tabulate import tabulate
 
 from . import themes
-from .core import ARROWS, GLOBAL_CATEGORIES
+from .core import ARROWS, GLOBAL_CATEGORIES, HELP_STATS
 from .core.base_help import EMPTY_STRING, BaguetteHelp
 from .core.category import Arrow, Category, get_category
-from .core.utils import LINK_REGEX, emoji_converter
+from .core.store import CategoryStore
+from .core.utils import LINK_REGEX, clear_command_metadata, emoji_converter, read_cog_tags
 from .core.views import ComponentType, MenuPicker, MenuView
 
+LOG = logging.getLogger("red.customhelp")
+
 _ = Translator("CustomHelp", __file__)
 
 # Swtichable alphabetic ordered display
@@ -88,6 +88,7 @@ class CustomHelp(commands.Cog):
                 "menutype": "buttons",  # "emojis","buttons","select","hidden"
                 "arrowtype": "buttons",  # "emojis","buttons","select","hidden"
                 "deletemessage": False,
+                "persistent": False,
             },
             "arrows": [
                 {"name": "force_left", "emoji": "⏮️", "style": "primary", "label": ""},
@@ -100,9 +101,20 @@ class CustomHelp(commands.Cog):
             "blacklist": {"nsfw": [], "dev": []},
         }
         self.config.register_global(**self.chelp_global)
-
-    def cog_unload(self):
+        # Kept around so that cog_load can reuse it if the themes didn't change
+        self._formatter: Optional[BaguetteHelp] = None
+        self.category_store = CategoryStore(self.config.categories, self.apply_category_edit)
+        # info.json path -> (mtime, tags), for chelp auto
+        self._tag_cache: Dict[str, Tuple[int, List[str]]] = {}
+        self._prewarm_task: Optional[asyncio.Task] = None
+
+    async def cog_unload(self):
+        if self._prewarm_task is not None:
+            self._prewarm_task.cancel()
+        if self._formatter is not None:
+            self._formatter.cancel_prerenders()
         self.bot.reset_help_formatter()
+        await self.category_store.flush()
 
     def format_help_for_context(self, ctx: commands.Context) -> str:
         """
@@ -131,37 +143,46 @@ class CustomHelp(commands.Cog):
 
     async def refresh_cache(self):
         """Get's the config and re-populates the GLOBAL_CATEGORIES"""
-        # Just in case if there's no uncategorised category
-        await self.add_placeholder_uncategorised()
-
-        # Blocking?
-        my_categories = await self.config.categories()
+        # Also adds the uncategorised category if there's none
+        await self.category_store.load()
         GLOBAL_CATEGORIES.clear()
-        for cat_data in my_categories:
-            cat_obj = Category(**cat_data)
-            # Correct the emoji types
-            cat_obj.reaction = emoji_converter(self.bot, cat_obj.reaction)
-            GLOBAL_CATEGORIES.append(cat_obj)
-
-        # make the uncategorised cogs
-        all_loaded_cogs = set(self.bot.cogs.keys())
-        uncategorised = all_loaded_cogs - set(
-            chain(*(category["cogs"] for category in my_categories))
+        for cat_data in self.category_store.data:
+            GLOBAL_CATEGORIES.append(self.make_category(cat_data))
+        self.sync_uncategorised()
+        self.invalidate_help_cache(categories_changed=True)
+
+    def apply_category_edit(self, old: List[dict], new: List[dict]):
+        """Brings GLOBAL_CATEGORIES up to date after a category edit
+        Categories the edit didn't touch are kept as they are"""
+        previous = {cat_data["name"]: cat_data for cat_data in old}
+        categories = []
+        for cat_data in new:
+            cat_obj = GLOBAL_CATEGORIES.find(cat_data["name"])
+            if cat_obj is None or previous.get(cat_data["name"]) != cat_data:
+                cat_obj = self.make_category(cat_data)
+            categories.append(cat_obj)
+        GLOBAL_CATEGORIES.replace(categories)
+        self.sync_uncategorised()
+        self.invalidate_help_cache(categories_changed=True)
+
+    def make_category(self, cat_data: dict) -> Category:
+        # Only the loaded cogs, cog add/remove events keep it that way. This is a copy as well,
+        # the live cache must not write into the config data
+        cogs = [cog_name for cog_name in cat_data["cogs"] if cog_name in self.bot.cogs]
+        cat_obj = Category(**{**cat_data, "cogs": cogs})
+        # Correct the emoji types
+        cat_obj.reaction = emoji_converter(self.bot, cat_obj.reaction)
+        return cat_obj
+
+    def sync_uncategorised(self):
+        """Every loaded cog that isn't in a category goes to uncategorised"""
+        categorised = set(
+            chain.from_iterable(cat_data["cogs"] for cat_data in self.category_store.data)
+        )
+        GLOBAL_CATEGORIES.set_cogs(
+            GLOBAL_CATEGORIES.uncategorised,
+            [cog_name for cog_name in self.bot.cogs if cog_name not in categorised],
         )
-
-        GLOBAL_CATEGORIES.uncategorised.cogs = list(uncategorised)
-
-    async def add_placeholder_uncategorised(self):
-        """Create and sync uncategorised category if doesn't exist"""
-        for cat in await self.config.categories():
-            if cat.get("is_uncat", False) == True:
-                break
-        else:
-            uncat_obj = Category(
-                name="uncategorised", desc="Miscellaneous cogs", cogs=[], is_uncat=True
-            )
-            async with self.config.categories() as conf_cat:
-                conf_cat.append(uncat_obj.to_dict())
 
     async def cog_load(self):
         """Adds the themes and loads the formatter"""
@@ -206,44 +227,123 @@ class CustomHelp(commands.Cog):
         # This is needed to be on top so that Cache gets populated no matter what (supplements chelp create)
         await self.refresh_cache()
         await self.refresh_arrows()
+        await self.setup_formatter()
 
+    async def setup_formatter(self):
+        """Loads the configured themes and settings on the formatter and sets it"""
         settings = await self.config.settings()
         if not settings["set_formatter"]:
             return
 
-        # Setup the formatter
-        main_theme = BaguetteHelp(
-            self.bot, await self.config.settings(), await self.config.blacklist()
-        )
+        blacklist = await self.config.blacklist()
         theme = await self.config.theme()
-        if all(theme.values()) is not None:
-            for feature in theme:
-                if theme[feature]:
-                    inherit_feature = getattr(
-                        themes.list[theme[feature]], self.feature_list[feature]
-                    )
-                    setattr(
-                        main_theme,
-                        self.feature_list[feature],
-                        MethodType(inherit_feature, main_theme),
-                    )
+        main_theme = self._formatter
+        if main_theme is None:
+            main_theme = self._formatter = BaguetteHelp(self.bot, settings, blacklist)
+        else:
+            # Reused, so only the features whose theme changed are rebound
+            main_theme.settings = settings
+            main_theme.blacklist_names = blacklist
+            main_theme.render_cache.clear()
+            main_theme.cancel_prerenders()
+        selection = self.get_theme_selection(main_theme)
+        for feature, theme_name in theme.items():
+            if selection[feature] != theme_name:
+                self.swap_theme(feature, theme_name)
         self.bot.set_help_formatter(main_theme)
+        if self._prewarm_task is not None:
+            self._prewarm_task.cancel()
+        self._prewarm_task = asyncio.create_task(self.prewarm(main_theme))
+
+    def swap_theme(self, feature: str, theme: Optional[str]) -> bool:
+        """Binds a feature of the formatter to a theme, None for the default one
+
+        Only the rendered pages of that feature are dropped, every other cache stays warm.
+        Returns False if the theme doesn't have the feature"""
+        method = self.feature_list[feature]
+        if theme is None:
+            func = getattr(BaguetteHelp, method)
+        elif method in themes.list.features(theme):
+            # load up the attribute,Monkey patch me daddy UwU
+            func = getattr(themes.list[theme], method)
+        else:
+            return False
+        setattr(self._formatter, method, MethodType(func, self._formatter))
+        self._formatter.render_cache.invalidate("feature:" + method)
+        return True
+
+    async def prewarm(self, formatter: BaguetteHelp):
+        await self.bot.wait_until_red_ready()
+        try:
+            await formatter.prewarm()
+        except Exception:
+            # Nothing is lost, everything it builds is built on first use as well
+            LOG.exception("Pre-warming the help failed")
+
+    def get_theme_selection(self, formatter: BaguetteHelp) -> Dict[str, Optional[str]]:
+        """The theme each feature of the formatter is bound to, in the same format as the config"""
+        selection = {}
+        for feature, method in self.feature_list.items():
+            theme = formatter.theme_of(method)
+            selection[feature] = None if theme == "default" else theme
+        return selection
 
     @commands.Cog.listener("on_cog_add")
     async def handle_new_cog_entries(self, cog: commands.Cog):
         cog_name = cog.__class__.__name__
         # GLOBAL_CATEGORIES should be populated by now, cause cog_load is called before this
-        for cat in GLOBAL_CATEGORIES:
-            if cog_name in cat.cogs:
-                break
-        else:
-            GLOBAL_CATEGORIES.uncategorised.cogs.append(cog_name)
+        if (category := GLOBAL_CATEGORIES.category_of(cog_name)) is None:
+            if cat_data := self.category_store.category_of(cog_name):
+                # Back into its category, at its configured spot
+                category = GLOBAL_CATEGORIES.get(cat_data["name"])
+                order = {name: index for index, name in enumerate(cat_data["cogs"])}
+                position = sum(
+                    1 for name in category.cogs if order.get(name, -1) < order[cog_name]
+                )
+                GLOBAL_CATEGORIES.add_cog(category, cog_name, position)
+            else:
+                category = GLOBAL_CATEGORIES.uncategorised
+                GLOBAL_CATEGORIES.add_cog(category, cog_name)
+        if (formatter := self._formatter) is not None:
+            formatter.command_index.add_cog(cog)
+            formatter.search_index.add_cog(cog)
+        self.invalidate_cog_pages(cog, category)
+        if cog.qualified_name == "Permissions":
+            # Loading it applies its rules to every command
+            self.invalidate_help_cache()
+
+    @commands.Cog.listener("on_cog_remove")
+    async def handle_cog_remove(self, cog: commands.Cog):
+        # Only the live cache, the cog stays in its category in config for when it's loaded again
+        category = GLOBAL_CATEGORIES.remove_cog(cog.__class__.__name__)
+        if (formatter := self._formatter) is not None:
+            formatter.command_index.remove_cog(cog)
+            formatter.alias_cache.remove_cog(cog)
+            formatter.search_index.remove_cog(cog)
+        self.invalidate_cog_pages(cog, category)
+        if cog.qualified_name == "Permissions":
+            # Unloading it resets the rules of every command
+            self.invalidate_help_cache()
+
+    @commands.Cog.listener("on_interaction")
+    async def handle_persistent_menus(self, interaction: discord.Interaction):
+        if interaction.type == discord.InteractionType.component and isinstance(
+            self.bot._help_formatter, BaguetteHelp
+        ):
+            await self.bot._help_formatter.persistent_menus.handle_interaction(interaction)
+
+    @commands.Cog.listener("on_command_completion")
+    async def handle_alias_changes(self, ctx: commands.Context):
+        # Alias has no events of its own, any of its commands might have changed an alias
+        if ctx.cog is not None and ctx.cog.qualified_name == "Alias":
+            self.invalidate_help_cache(commands_changed=True)
 
-    # TODO implement!, careful, people do reload cogs
-    # @commands.Cog.listener("on_cog_remove")
-    # async def handle_cog_remove(self, cog: commands.Cog):
-    #     # cog_name = cog.__class__.__name__
-    #     pass
+    @commands.Cog.listener("on_command_completion")
+    async def handle_permission_changes(self, ctx: commands.Context):
+        # Permission rules aren't in the render keys and Permissions has no events either,
+        # any of its commands might have changed who can run what
+        if ctx.cog is not None and ctx.cog.qualified_name == "Permissions":
+            self.invalidate_help_cache()
 
     @commands.is_owner()
     @commands.group()
@@ -255,7 +355,7 @@ class CustomHelp(commands.Cog):
         """Short info about various themes"""
         emb = discord.Embed(color=await ctx.embed_color(), title="All Themes")
         for theme in themes.list:
-            emb.add_field(name=theme, value=themes.list[theme].__doc__, inline=False)
+            emb.add_field(name=theme, value=themes.list.doc(theme), inline=False)
         await ctx.send(embed=emb)
 
     @chelp.command()
@@ -263,11 +363,14 @@ class CustomHelp(commands.Cog):
         """Force refresh the list of categories, This would reset all the uninstalled/unloaded cogs and will put them into uncategorised."""
         all_cogs = set(self.bot.cogs.keys())
 
-        async with self.config.categories() as my_categories:
-            for category in my_categories:
-                if category.get("is_uncat"):
-                    continue
-                category["cogs"][:] = [cog for cog in category["cogs"] if cog in all_cogs]
+        try:
+            async with self.category_store.transaction() as my_categories:
+                for category in my_categories:
+                    if category.get("is_uncat"):
+                        continue
+                    category["cogs"][:] = [cog for cog in category["cogs"] if cog in all_cogs]
+        except ValueError as e:
+            return await ctx.send(f"Nothing was saved:\n{e}")
 
         await self.refresh_cache()
         await ctx.tick()
@@ -275,45 +378,77 @@ class CustomHelp(commands.Cog):
     @chelp.command()
     async def auto(self, ctx):
         """Auto categorise cogs based on it's tags and display them"""
-        data: Dict[str, List[str]] = {}
-        # Thanks trusty pathlib is awesome.
-        for k, a in self.bot.cogs.items():
-            check = Path(getfile(a.__class__)).parent / "info.json"
-            if path.isfile(check):
-                with open(check, "r", encoding="utf-8") as f:
-                    try:
-                        tmp = json.load(f)
-                        data[k] = [i.lower() for i in tmp["tags"]] if "tags" in tmp else []
-                    except json.JSONDecodeError:
-                        # TODO Implement logger you lazy bum <_<
-                        print("[ERROR] Invaild JSON in cog {}".format(k))
-                        data[k] = []
-
-            else:
-                data[k] = []
+        cog_classes = {name: cog.__class__ for name, cog in sorted(self.bot.cogs.items())}
+        # Reading all the info.json files blocks, keep it off the event loop
+        data = await asyncio.to_thread(read_cog_tags, cog_classes, self._tag_cache)
 
         # Ofc grouping was done with the help random ppl helping me in pydis guild+stackoverflow :aha:
         popular = Counter(chain.from_iterable(data.values()))
-        groups = defaultdict(set)
-        for key, tags in data.items():
+        groups = defaultdict(list)
+        for key, tags in data.items():  # sorted by cog name
             if tags:
-                tag = max(
-                    tags,
-                    key=popular.get,  # type:ignore https://github.com/microsoft/pylance-release/issues/1022
-                )
-                groups[tag].add(key)
+                # Most popular tag, ties go alphabetically so the result doesn't change between runs
+                tag = min(tags, key=lambda tag: (-popular[tag], tag))
+                groups[tag].append(key)
 
         final = {"uncategorised": []}
         for i, j in groups.items():
             if len(j) > 1:
-                final[i] = list(j)
+                final[i] = j
             else:
                 final["uncategorised"].extend(j)
-        for i in [
-            box(page, lang="yaml")
-            for page in pagify(yaml.dump(final), shorten_by=0, page_length=1990)
-        ]:
-            await ctx.send(i)
+
+        # Sent as the pages fill up, in the same order yaml.dump would give
+        page = ""
+        for name in sorted(final):
+            chunk = yaml.dump({name: final[name]})
+            if page and len(page) + len(chunk) > 1990:
+                await ctx.send(box(page, lang="yaml"))
+                page = ""
+            if len(chunk) > 1990:
+                for part in pagify(chunk, shorten_by=0, page_length=1990):
+                    await ctx.send(box(part, lang="yaml"))
+            else:
+                page += chunk
+        if page:
+            await ctx.send(box(page, lang="yaml"))
+
+    @chelp.command()
+    async def stats(self, ctx, reset: bool = False):
+        """Show where help spends its time\n`[p]chelp stats 1` to also start over"""
+        formatter = self._formatter
+        rows = HELP_STATS.rows()
+        if rows:
+            table = tabulate(
+                [
+                    (phase, theme, count, f"{p50:.1f}", f"{p95:.1f}", f"{p99:.1f}")
+                    for phase, theme, count, p50, p95, p99 in rows
+                ],
+                headers=["phase", "theme", "count", "p50 ms", "p95 ms", "p99 ms"],
+                tablefmt="presto",
+            )
+        else:
+            table = "Nothing timed yet"
+        lines = [f"Since <t:{int(HELP_STATS.since)}:R>"]
+        if formatter is not None:
+            cache = formatter.render_cache
+            lookups = cache.hits + cache.misses
+            ratio = f"{cache.hits / lookups:.0%}" if lookups else "-"
+            lines += [
+                f"Render cache: {ratio} hits over {lookups} lookups, {len(cache)} pages cached",
+                f"Renders shared with an identical one in progress: {formatter.renders_shared}",
+                f"Live menus: {len(formatter.live_menus)}",
+                f"Messages saved by packing pages: {formatter.api_calls_saved}",
+            ]
+        lines.append(f"Category config writes: {self.category_store.writes}")
+        await ctx.send("\n".join(lines))
+        for page in pagify(table, page_length=1985, shorten_by=0):
+            await ctx.send(box(page))
+        if reset:
+            HELP_STATS.clear()
+            if formatter is not None:
+                formatter.render_cache.hits = formatter.render_cache.misses = 0
+                formatter.renders_shared = 0
 
     @chelp.command()
     async def show(self, ctx):
@@ -330,6 +465,7 @@ class CustomHelp(commands.Cog):
             "arrowtype": "ArrowType",
             "timeout": "Timeout",
             "deletemessage": "Delete user msg",
+            "persistent": "Persistent",
         }
         other_settings = []
         # url doesnt exist now, that's why the check. sorry guys.
@@ -376,9 +512,12 @@ class CustomHelp(commands.Cog):
         async with ctx.typing():
             try:
                 if setval:
-                    # TODO potiential save a config call?
                     await self.config.settings.set_formatter.set(True)
-                    await self.cog_load()
+                    if self._formatter is None:
+                        await self.setup_formatter()
+                    else:
+                        # Kept in sync while it was off, caches included
+                        self.bot.set_help_formatter(self._formatter)
                     await ctx.send("Formatter set to custom")
                 else:
                     await self.config.settings.set_formatter.set(False)
@@ -419,19 +558,15 @@ class CustomHelp(commands.Cog):
                 await ctx.send("Invalid Format, Likely you added an extra ':' or '-'")
                 return
 
-        available_categories = [
+        available_categories = {
             category.name for category in GLOBAL_CATEGORIES if category.is_uncat == False
-        ]
-        # Not using cache (GLOBAL_CATEGORIES.uncategorised.cogs) cause cog unloads aren't tracked
-        all_cogs = set(self.bot.cogs.keys())
-        uncategorised = all_cogs - set(
-            chain(
-                *(
-                    GLOBAL_CATEGORIES.get(category_name).cogs
-                    for category_name in available_categories
-                )
-            )
-        )
+        }
+        # The loaded cogs that aren't in a named category, by the names bot.cogs uses
+        uncategorised = set()
+        for cog_name in self.bot.cogs:
+            category = GLOBAL_CATEGORIES.category_of(cog_name)
+            if category is None or category.is_uncat:
+                uncategorised.add(cog_name)
 
         uncat_name = GLOBAL_CATEGORIES.uncategorised.name
         failed_cogs = []
@@ -462,12 +597,15 @@ class CustomHelp(commands.Cog):
                 to_config["new"].append(parse_to_config(category))
 
         # Writing to config
-        async with self.config.categories() as conf_cat:
-            conf_cat.extend(to_config["new"])
-            for category_name, cat_conf in to_config["existing"].items():
-                for config_category in conf_cat:
-                    if config_category["name"] == category_name:
-                        config_category["cogs"].extend(cat_conf)
+        try:
+            async with self.category_store.transaction() as conf_cat:
+                conf_cat.extend(to_config["new"])
+                for category_name, cat_conf in to_config["existing"].items():
+                    for config_category in conf_cat:
+                        if config_category["name"] == category_name:
+                            config_category["cogs"].extend(cat_conf)
+        except ValueError as e:
+            return await ctx.send(f"Nothing was saved:\n{e}")
 
         for page in pagify(
             (
@@ -482,7 +620,6 @@ class CustomHelp(commands.Cog):
             )
         ):
             await ctx.send(page)
-        await self.refresh_cache()
 
     @chelp.command()
     async def edit(self, ctx, *, yaml_txt=None):
@@ -526,10 +663,9 @@ class CustomHelp(commands.Cog):
             for i, my_list in parsed_data.items()
         }
         check_options = ["name", "desc", "long_desc", "reaction", "thumbnail", "label", "style"]
-        available_categories = [category.name for category in GLOBAL_CATEGORIES]
-        already_present_emojis = [str(i.reaction) for i in GLOBAL_CATEGORIES if i.reaction] + [
+        already_present_emojis = {str(i.reaction) for i in GLOBAL_CATEGORIES if i.reaction} | {
             i.emoji for i in ARROWS
-        ]
+        }
         failed = []  # example: [('desc','categoryname')]
 
         def validity_checker(category, item):
@@ -538,7 +674,7 @@ class CustomHelp(commands.Cog):
             if key in check_options:
                 # name shall not contain spaces and should be unique
                 if key == "name":
-                    if " " not in value and value not in available_categories:
+                    if " " not in value and value not in GLOBAL_CATEGORIES:
                         return value
                 # dupe emoji and valid emoji?
                 elif key == "reaction":
@@ -553,7 +689,7 @@ class CustomHelp(commands.Cog):
         to_config = {}
         for category_name in parsed_data:
             # default uncat name is "uncategorised"
-            if category_name in available_categories:
+            if category_name in GLOBAL_CATEGORIES:
                 to_config[category_name] = {}
 
                 for item in parsed_data[category_name]:
@@ -566,11 +702,14 @@ class CustomHelp(commands.Cog):
                 failed.append((("[Not a valid category name]", "Everything"), category_name))
 
         if to_config:
-            async with self.config.categories() as conf_cat:
-                for category_name in to_config.keys():
-                    for category_config in conf_cat:
-                        if category_config["name"] == category_name:
-                            category_config.update(to_config[category_name])
+            try:
+                async with self.category_store.transaction() as conf_cat:
+                    for category_name in to_config.keys():
+                        for category_config in conf_cat:
+                            if category_config["name"] == category_name:
+                                category_config.update(to_config[category_name])
+            except ValueError as e:
+                return await ctx.send(f"Nothing was saved:\n{e}")
 
         for page in pagify(
             "Successfully added the edits"
@@ -584,14 +723,12 @@ class CustomHelp(commands.Cog):
             )
         ):
             await ctx.send(page)
-        await self.refresh_cache()
 
     # Taken from api listing from core
     @chelp.command()
     async def list(self, ctx):
         """Show the list of categories and the cogs in them"""
-        # TODO maybe its a better option to read from cache than config?
-        available_categories_raw = await self.config.categories()
+        available_categories_raw = self.category_store.data
         all_cogs = set(self.bot.cogs.keys())
         uncategorised = all_cogs - set(
             chain(*(category["cogs"] for category in available_categories_raw))
@@ -622,27 +759,14 @@ class CustomHelp(commands.Cog):
             await ctx.send("You are not using the custom formatter")
             return
 
-        def loader(theme, feature):
-            inherit_theme = themes.list[theme]
-            if hasattr(inherit_theme, self.feature_list[feature]):
-                inherit_feature = getattr(themes.list[theme], self.feature_list[feature])
-                # load up the attribute,Monkey patch me daddy UwU
-                setattr(
-                    self.bot._help_formatter,
-                    self.feature_list[feature],
-                    MethodType(inherit_feature, self.bot._help_formatter),
-                )
-                return True
-            return False
-
         if theme in themes.list:
             if feature == "all":
                 for i in self.feature_list:
-                    if loader(theme, i):
+                    if self.swap_theme(i, theme):
                         await getattr(self.config.theme, i).set(theme)
                 await ctx.tick()
             elif feature in self.feature_list:
-                if loader(theme, feature):
+                if self.swap_theme(feature, theme):
                     await ctx.send(f"Successfully loaded {feature} from {theme}")
                     # update config
                     await getattr(self.config.theme, feature).set(theme)
@@ -662,9 +786,14 @@ class CustomHelp(commands.Cog):
         await ctx.bot.wait_for("reaction_add", check=pred)
         if pred.result is True:
             self.bot.reset_help_formatter()
-            self.bot.set_help_formatter(
-                BaguetteHelp(self.bot, await self.config.settings(), await self.config.blacklist())
-            )
+            if self._formatter is None:
+                self._formatter = BaguetteHelp(
+                    self.bot, await self.config.settings(), await self.config.blacklist()
+                )
+            else:
+                for feature in self.feature_list:
+                    self.swap_theme(feature, None)
+            self.bot.set_help_formatter(self._formatter)
             await self.config.theme.set(
                 {"cog": None, "category": None, "command": None, "main": None}
             )
@@ -689,10 +818,11 @@ class CustomHelp(commands.Cog):
             return await ctx.send("Timed out, please try again.")
         if msg.content == "y":
             # TODO there must be a better method in getting the defaults. remember?
+            self.category_store.discard()
             await self.config.clear_all()
             self.config.register_global(**self.chelp_global)
             self.bot.reset_help_formatter()
-            await self._setup()
+            await self.cog_load()
             await ctx.send("Cleared everything.")
         else:
             await ctx.send("Aborted")
@@ -704,14 +834,7 @@ class CustomHelp(commands.Cog):
             await ctx.send("You are not using the custom formatter")
             return
         if feature in self.feature_list:
-            setattr(
-                self.bot._help_formatter,
-                self.feature_list[feature],
-                MethodType(
-                    getattr(BaguetteHelp, self.feature_list[feature]),
-                    self.bot._help_formatter,
-                ),
-            )
+            self.swap_theme(feature, None)
         else:
             await ctx.send(f"Invalid feature: {feature}")
             return
@@ -739,10 +862,13 @@ class CustomHelp(commands.Cog):
         except asyncio.TimeoutError:
             return await ctx.send("Timed out, please try again.")
         if msg.content == "y":
-            # TODO there must be a better method in getting the defaults. remember?
-            await self.config.categories.clear()
+            try:
+                async with self.category_store.transaction() as conf_cat:
+                    # The uncategorised placeholder gets added back
+                    conf_cat.clear()
+            except ValueError as e:
+                return await ctx.send(f"Nothing was saved:\n{e}")
             await ctx.send("Cleared all categories")
-            await self.refresh_cache()
             return
         await ctx.send("Aborted")
 
@@ -755,10 +881,9 @@ class CustomHelp(commands.Cog):
         invalid = []
         text = ""
         for given_category in category_names:
-            for category in GLOBAL_CATEGORIES:
-                if given_category == category.name and category.is_uncat == False:
-                    to_config.append(category.name)
-                    break
+            category = GLOBAL_CATEGORIES.find(given_category)
+            if category is not None and category.is_uncat == False:
+                to_config.append(category.name)
             else:
                 # Uncategorised Name
                 if given_category == GLOBAL_CATEGORIES.uncategorised.name:
@@ -768,17 +893,19 @@ class CustomHelp(commands.Cog):
                 else:
                     invalid.append(given_category)
 
-        async with self.config.categories() as conf_cat:
-            new_conf_list = []
-            for cat in conf_cat:
-                if cat["name"] not in to_config:
-                    new_conf_list.append(cat)
-            conf_cat[:] = new_conf_list
+        try:
+            async with self.category_store.transaction() as conf_cat:
+                new_conf_list = []
+                for cat in conf_cat:
+                    if cat["name"] not in to_config:
+                        new_conf_list.append(cat)
+                conf_cat[:] = new_conf_list
+        except ValueError as e:
+            return await ctx.send(f"Nothing was saved:\n{e}")
 
         text += _("Successfully removed: ") + (", ".join(to_config) + "\n") if to_config else ""
         if invalid:
             text += _("These categories aren't present in the list:\n" + ",".join(invalid))
-        await self.refresh_cache()
         await ctx.send(text)
 
     @remove.command(aliases=["cogs"], require_var_positional=True)
@@ -792,10 +919,8 @@ class CustomHelp(commands.Cog):
         invalid = []
 
         def category_from_cog(cog_name):
-            for category in GLOBAL_CATEGORIES:
-                if cog_name in category.cogs:
-                    return category.name
-            return None
+            category = GLOBAL_CATEGORIES.category_of(cog_name)
+            return category.name if category else None
 
         uncat_name = GLOBAL_CATEGORIES.uncategorised.name
         for cog_name in cog_names:
@@ -816,12 +941,15 @@ class CustomHelp(commands.Cog):
                     )
             else:
                 invalid.append(cog_name)
-        async with self.config.categories() as cat_conf:
-            for cat_name, cog_name in to_config:
-                for category in cat_conf:
-                    if cat_name == category["name"]:
-                        category["cogs"].remove(cog_name)
-                        break
+        try:
+            async with self.category_store.transaction() as cat_conf:
+                for cat_name, cog_name in to_config:
+                    for category in cat_conf:
+                        if cat_name == category["name"]:
+                            category["cogs"].remove(cog_name)
+                            break
+        except ValueError as e:
+            return await ctx.send(f"Nothing was saved:\n{e}")
         text = ""
         if to_config:
             text = "Successfully removed the following\n"
@@ -840,7 +968,6 @@ class CustomHelp(commands.Cog):
         if invalid:
             text += "The following cogs are invalid or unloaded:\n" + (", ".join(invalid))
 
-        await self.refresh_cache()
         for page in pagify(text, page_length=1985, shorten_by=0):
             await ctx.send(box(page, lang="yaml"))
 
@@ -921,6 +1048,15 @@ class CustomHelp(commands.Cog):
         self._update_conf("settings", "deletemessage", toggle)
         await ctx.send(f"Successfully set delete user toggle to {toggle}")
 
+    @chelp_settings.command()
+    async def persistent(self, ctx, toggle: bool):
+        """Make help menus that never time out and keep working after a restart.
+        This only applies to buttons and select menus, emoji menus are unchanged.
+        """
+        await self.config.settings.persistent.set(toggle)
+        self._update_conf("settings", "persistent", toggle)
+        await ctx.send(f"{'Enabled' if toggle else 'Disabled'} persistent help menus")
+
     @chelp_settings.command(aliases=["arrow"])
     async def arrows(self, ctx, *, correct_txt=None):
         """Add custom arrows for fun and profit"""
@@ -1031,7 +1167,7 @@ class CustomHelp(commands.Cog):
     async def add_nsfw(self, ctx, category: str):
         """Add categories to the nsfw list"""
         if cat_obj := get_category(category):
-            if "Core" in cat_obj.cogs:
+            if GLOBAL_CATEGORIES.category_of("Core") is cat_obj:
                 return await ctx.send(
                     "This category contains Core cog and shouldn't be hidden under any circumstances"
                 )
@@ -1071,7 +1207,7 @@ class CustomHelp(commands.Cog):
     async def add_dev(self, ctx, category: str):
         """Add categories to the dev list"""
         if cat_obj := get_category(category):
-            if "Core" in cat_obj.cogs:
+            if GLOBAL_CATEGORIES.category_of("Core") is cat_obj:
                 return await ctx.send(
                     "This category contains Core cog and shouldn't be hidden under any circumstances"
                 )
@@ -1109,7 +1245,7 @@ class CustomHelp(commands.Cog):
         outs = {i: [] for i in themes.list}
         for x in themes.list:
             for y in self.feature_list:
-                if self.feature_list[y] in themes.list[x].__dict__:
+                if self.feature_list[y] in themes.list.features(x):
                     outs[x].append((y, "\N{WHITE HEAVY CHECK MARK}"))
                 else:
                     outs[x].append((y, "❌"))
@@ -1155,16 +1291,18 @@ class CustomHelp(commands.Cog):
             except ValueError:
                 failed.append(cat_name)
 
-        async with self.config.categories() as cat_conf:
-            new_order = [cat_conf[cat_index] for cat_index in to_config]
+        try:
+            async with self.category_store.transaction() as cat_conf:
+                new_order = [cat_conf[cat_index] for cat_index in to_config]
 
-            for ind in range(len(cat_conf)):
-                if ind not in to_config:
-                    new_order.append(cat_conf[ind])
+                for ind in range(len(cat_conf)):
+                    if ind not in to_config:
+                        new_order.append(cat_conf[ind])
 
-            cat_conf[:] = new_order
+                cat_conf[:] = new_order
+        except ValueError as e:
+            return await ctx.send(f"Nothing was saved:\n{e}")
 
-        await self.refresh_cache()
         await ctx.send(
             "Successfully reordered the categories\n"
             + (
@@ -1182,16 +1320,16 @@ class CustomHelp(commands.Cog):
             em = discord.Embed(title=f"{command}", color=await ctx.embed_color())
             if cmd.cog:
                 cog_name = cmd.cog.__class__.__name__
-                for cat in GLOBAL_CATEGORIES:
-                    if cog_name in cat.cogs:
-                        em.add_field(name="Category:", value=cat.name, inline=False)
-                        em.add_field(name="Cog:", value=cog_name, inline=False)
-                        await ctx.send(embed=em)
-                        break
+                if cat := GLOBAL_CATEGORIES.category_of(cog_name):
+                    em.add_field(name="Category:", value=cat.name, inline=False)
+                    em.add_field(name="Cog:", value=cog_name, inline=False)
+                    await ctx.send(embed=em)
                 else:
                     await ctx.send("Impossible! report this to the cog owner of customhelp pls")
             else:
-                em.add_field(name="Category:", value=GLOBAL_CATEGORIES.category.name, inline=False)
+                em.add_field(
+                    name="Category:", value=GLOBAL_CATEGORIES.uncategorised.name, inline=False
+                )
                 em.add_field(name="Cog:", value="None", inline=False)
                 await ctx.send(embed=em)
         else:
@@ -1203,9 +1341,41 @@ class CustomHelp(commands.Cog):
         key = thumbnail
         value= https://some_url.com"""
 
-        # Only change if it's customhelp formatter
-        if isinstance(self.bot._help_formatter, BaguetteHelp):
-            getattr(self.bot._help_formatter, var)[key] = value
+        # Kept up to date even when toggled off, so toggling it back on can reuse it
+        if self._formatter is not None:
+            getattr(self._formatter, var)[key] = value
+            self.invalidate_help_cache()
+
+    def invalidate_cog_pages(self, cog: commands.Cog, category: Optional[Category]):
+        """Drop the rendered pages that mention the cog, after it got loaded or unloaded"""
+        if self._formatter is not None:
+            tags = ["bot", "cog:" + cog.qualified_name]
+            if category is not None:
+                tags.append("category:" + category.name)
+            # Cogs can add subcommands to groups of other cogs, the pages of those groups are
+            # tagged with the cog owning the group
+            tags.extend(
+                "cog:" + (command.parent.cog.qualified_name if command.parent.cog else "")
+                for command in cog.__cog_commands__
+                if command.parent is not None and command.parent.cog is not cog
+            )
+            self._formatter.render_cache.invalidate(*tags)
+            self._formatter.group_cache.clear()
+
+    def invalidate_help_cache(self, commands_changed: bool = False, categories_changed=False):
+        """Drop the rendered help pages, needed whenever categories, settings or themes change
+        commands_changed also drops the command index, alias cache and command metadata
+        Both drop the search index, it has the category names"""
+        if commands_changed:
+            clear_command_metadata()
+        if (formatter := self._formatter) is not None:
+            formatter.render_cache.clear()
+            formatter.group_cache.clear()
+            if commands_changed:
+                formatter.command_index.invalidate()
+                formatter.alias_cache.clear()
+            if commands_changed or categories_changed:
+                formatter.search_index.invalidate()
 
     async def parse_yaml(self, ctx, content):
         """Parse the yaml with basic structure checks"""
@@ -1227,4 +1397,4 @@ class CustomHelp(commands.Cog):
             if type(parsed_data[i]) != list:
                 await ctx.send("Invalid Format, Likely added unwanted spaces")
                 return
-        return parsed_data
\ No newline at end of file
+        return parsed_data
@@ -1,17 +1,70 @@
+import ast
 import os
+from collections.abc import Mapping
 from importlib import import_module
 from inspect import isclass
 from pkgutil import iter_modules
+from typing import Dict, Optional, Tuple
 
 from ..abc import ThemesMeta
 
-list = {}
 
-# This auto populates the list with the themes present in this folder
-pkg_dir = os.path.dirname(__file__)
-for module_loader, name, ispkg in iter_modules([pkg_dir]):
-    theme_module = import_module(f"{__name__}.{name}")
-    for attribute in dir(theme_module):
-        attr = getattr(theme_module, attribute)
-        if isclass(attr) and issubclass(attr, ThemesMeta) and attr is not ThemesMeta:
-            list[name] = attr
+class ThemeRegistry(Mapping):
+    """The themes present in this folder, name -> theme class
+
+    Names, docstrings and features are read from the source without importing anything,
+    a theme module is only imported when its class is asked for."""
+
+    def __init__(self, pkg_dir: str):
+        self._info: Dict[str, Tuple[Optional[str], Tuple[str, ...]]] = {}
+        self._classes: Dict[str, type] = {}
+        for module_loader, name, ispkg in iter_modules([pkg_dir]):
+            if not ispkg and (info := self._read(os.path.join(pkg_dir, f"{name}.py"))):
+                self._info[name] = info
+
+    @staticmethod
+    def _read(path: str):
+        """(docstring, features) of the theme class in the file"""
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and any(
+                getattr(base, "id", None) == ThemesMeta.__name__ for base in node.bases
+            ):
+                features = tuple(
+                    item.name
+                    for item in node.body
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                )
+                return ast.get_docstring(node, clean=False), features
+
+    def doc(self, name: str) -> Optional[str]:
+        return self._info[name][0]
+
+    def features(self, name: str) -> Tuple[str, ...]:
+        """Names of the format methods the theme defines"""
+        return self._info[name][1]
+
+    def __getitem__(self, name: str) -> type:
+        if name not in self._classes:
+            if name not in self._info:
+                raise KeyError(name)
+            theme_module = import_module(f"{__name__}.{name}")
+            for attribute in dir(theme_module):
+                attr = getattr(theme_module, attribute)
+                if isclass(attr) and issubclass(attr, ThemesMeta) and attr is not ThemesMeta:
+                    self._classes[name] = attr
+                    break
+        return self._classes[name]
+
+    def __contains__(self, name):
+        return name in self._info
+
+    def __iter__(self):
+        return iter(self._info)
+
+    def __len__(self):
+        return len(self._info)
+
+
+list = ThemeRegistry(os.path.dirname(__file__))
@@ -41,7 +41,7 @@ class Blocks(ThemesMeta):
             tablefmt="plain",
         )
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
             emb["thumbnail"] = obj.thumbnail
             emb["embed"]["title"] = (
@@ -89,7 +89,7 @@ class Blocks(ThemesMeta):
             tablefmt="plain",
         )
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
             if description:
                 emb["embed"]["description"] = "**" + description + "**"
@@ -11,8 +11,7 @@ from ..core.base_help import (
     commands,
     get_aliases,
     get_category_page_mapper_chunk,
-    get_cooldowns,
-    get_perms,
+    get_command_metadata,
     pagify,
 )
 
@@ -23,7 +22,7 @@ class DankHelp(ThemesMeta):
     async def format_bot_help(
         self, ctx: Context, help_settings: HelpSettings, get_pages: bool = False
     ):
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
             description = ctx.bot.description or ""
             emb["embed"]["description"] = description
@@ -35,7 +34,7 @@ class DankHelp(ThemesMeta):
             for cat in filtered_categories:
                 if cat.cogs:
                     if not await get_category_page_mapper_chunk(
-                        self, get_pages, ctx, cat, help_settings, page_mapping
+                        self, ctx, cat, help_settings, page_mapping
                     ):
                         continue
 
@@ -62,7 +61,7 @@ class DankHelp(ThemesMeta):
                     page_mapping=page_mapping,
                 )
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
 
     async def format_category_help(
         self,
@@ -78,7 +77,7 @@ class DankHelp(ThemesMeta):
         if not coms:
             return
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
             emb["thumbnail"] = obj.thumbnail
             emb["embed"]["title"] = (
@@ -114,7 +113,7 @@ class DankHelp(ThemesMeta):
                     help_settings=help_settings,
                 )
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
 
     async def format_command_help(
         self, ctx: Context, obj: commands.Command, help_settings: HelpSettings
@@ -130,8 +129,9 @@ class DankHelp(ThemesMeta):
             return
 
         command = obj
+        metadata = get_command_metadata(ctx, command)
         signature = _("`{ctx.clean_prefix}{command.qualified_name} {command.signature}`").format(
-            ctx=ctx, command=command
+            ctx=ctx, command=metadata
         )
         subcommands = None
 
@@ -139,7 +139,7 @@ class DankHelp(ThemesMeta):
             grp = cast(commands.Group, command)
             subcommands = await self.get_group_help_mapping(ctx, grp, help_settings=help_settings)
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
             if description := command.description:
                 emb["embed"]["title"] = f"{description[:250]}"
@@ -157,10 +157,10 @@ class DankHelp(ThemesMeta):
             if aliases := get_aliases(command, ctx.invoked_with):
                 emb["fields"].append(EmbedField("Aliases", ", ".join(aliases), False))
 
-            if final_perms := get_perms(command):
+            if final_perms := metadata.perms:
                 emb["fields"].append(EmbedField("Permissions", final_perms, False))
 
-            if cooldowns := get_cooldowns(command):
+            if cooldowns := metadata.cooldowns:
                 emb["fields"].append(EmbedField("Cooldowns:", "\n".join(cooldowns), False))
 
             if value:
@@ -174,7 +174,7 @@ class DankHelp(ThemesMeta):
                     return a_line[:67] + ".."
 
                 subtext = "\n" + "\n".join(
-                    shorten_line(f"`{name:<15}:`{command.format_shortdoc_for_context(ctx)}")
+                    shorten_line(f"`{name:<15}:`{get_command_metadata(ctx, command).shortdoc}")
                     for name, command in sorted(subcommands.items())
                 )
                 for i, page in enumerate(pagify(subtext, page_length=500, shorten_by=0)):
@@ -193,4 +193,4 @@ class DankHelp(ThemesMeta):
                 help_settings=help_settings,
             )
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
@@ -18,14 +18,15 @@ class DannyHelp(ThemesMeta):
     async def format_bot_help(
         self, ctx: Context, help_settings: HelpSettings, get_pages: bool = False
     ):
-        if await ctx.embed_requested():  # Maybe redirect to non-embed minimal format
+        hctx = await self.help_context(ctx)
+        if hctx.embed_requested:  # Maybe redirect to non-embed minimal format
             emb = await self.embed_template(help_settings, ctx, ctx.bot.description)
             filtered_categories = await self.filter_categories(ctx, GLOBAL_CATEGORIES)
             page_mapping = {}
             for cat in filtered_categories:
                 if cat.cogs:
                     if not await get_category_page_mapper_chunk(
-                        self, get_pages, ctx, cat, help_settings, page_mapping
+                        self, ctx, cat, help_settings, page_mapping
                     ):
                         continue
 
@@ -50,7 +51,7 @@ class DannyHelp(ThemesMeta):
                     page_mapping=page_mapping,
                 )
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
 
     async def format_category_help(
         self,
@@ -66,7 +67,7 @@ class DannyHelp(ThemesMeta):
         if not coms:
             return
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
             emb["thumbnail"] = obj.thumbnail
 
@@ -92,4 +93,4 @@ class DannyHelp(ThemesMeta):
                 )
 
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
@@ -11,11 +11,13 @@ from ..core.base_help import (
     _,
     cast,
     commands,
-    get_cooldowns,
-    get_perms,
+    get_command_metadata,
     pagify,
-    shorten_line,
 )
+from ..core.utils import shorten_line
+
+# Backward compatible, aliases in the syntax are shown from 3.4.6 onwards
+SHOW_ALIASES = version.parse(__version__) >= version.parse("3.4.6")
 
 
 class JustCore(ThemesMeta):
@@ -35,7 +37,7 @@ class JustCore(ThemesMeta):
         if not coms:
             return
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
             if description := obj.long_desc:
                 emb["embed"]["title"] = f"{description[:250]}"
@@ -43,7 +45,9 @@ class JustCore(ThemesMeta):
             for cog_name, data in coms:
                 title = f"**__{cog_name}:__**"
                 cog_text = "\n".join(
-                    shorten_line(f"`{name:<15}:` **{command.format_shortdoc_for_context(ctx)}**")
+                    shorten_line(
+                        f"`{name:<15}:` **{get_command_metadata(ctx, command).shortdoc}**"
+                    )
                     for name, command in sorted(data.items())
                 )
 
@@ -64,19 +68,21 @@ class JustCore(ThemesMeta):
                 )
 
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
 
     async def format_cog_help(self, ctx: Context, obj: commands.Cog, help_settings: HelpSettings):
         coms = await self.get_cog_help_mapping(ctx, obj, help_settings=help_settings)
         if not (coms or help_settings.verify_exists):
             return
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx, obj.format_help_for_context(ctx))
 
             if coms:
                 command_text = "\n".join(
-                    shorten_line(f"`{name:<15}:` **{command.format_shortdoc_for_context(ctx)}**")
+                    shorten_line(
+                        f"`{name:<15}:` **{get_command_metadata(ctx, command).shortdoc}**"
+                    )
                     for name, command in sorted(coms.items())
                 )
                 for i, page in enumerate(pagify(command_text, page_length=500, shorten_by=0)):
@@ -94,7 +100,7 @@ class JustCore(ThemesMeta):
                     help_settings=help_settings,
                 )
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
 
     async def format_command_help(
         self, ctx: Context, obj: commands.Command, help_settings: HelpSettings
@@ -110,13 +116,13 @@ class JustCore(ThemesMeta):
             return
 
         command = obj
+        metadata = get_command_metadata(ctx, command)
 
         signature = _(
             "Syntax: {ctx.clean_prefix}{command.qualified_name} {command.signature}"
-        ).format(ctx=ctx, command=command)
+        ).format(ctx=ctx, command=metadata)
 
-        # Backward compatible.
-        if version.parse(__version__) >= version.parse("3.4.6"):
+        if SHOW_ALIASES:
             aliases = command.aliases
             if help_settings.show_aliases and aliases:
                 alias_fmt = _("Aliases") if len(command.aliases) > 1 else _("Alias")
@@ -154,7 +160,7 @@ class JustCore(ThemesMeta):
             grp = cast(commands.Group, command)
             subcommands = await self.get_group_help_mapping(ctx, grp, help_settings=help_settings)
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(
                 help_settings, ctx, command.format_help_for_context(ctx)
             )
@@ -163,10 +169,10 @@ class JustCore(ThemesMeta):
 
             emb["embed"]["description"] = box(signature, lang="properties")
 
-            if final_perms := get_perms(command):
+            if final_perms := metadata.perms:
                 emb["fields"].append(EmbedField("**__Permissions__**", final_perms, False))
 
-            if cooldowns := get_cooldowns(command):
+            if cooldowns := metadata.cooldowns:
                 emb["fields"].append(EmbedField("**__Cooldowns__**:", "\n".join(cooldowns), False))
 
             if subcommands:
@@ -177,7 +183,9 @@ class JustCore(ThemesMeta):
                     return a_line[:67] + "...**"
 
                 subtext = "\n".join(
-                    shorten_line(f"`{name:<15}:` **{command.format_shortdoc_for_context(ctx)}**")
+                    shorten_line(
+                        f"`{name:<15}:` **{get_command_metadata(ctx, command).shortdoc}**"
+                    )
                     for name, command in sorted(subcommands.items())
                 )
                 for i, page in enumerate(pagify(subtext, page_length=500, shorten_by=0)):
@@ -195,4 +203,4 @@ class JustCore(ThemesMeta):
                 help_settings=help_settings,
             )
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
@@ -10,8 +10,7 @@ from ..core.base_help import (
     commands,
     get_aliases,
     get_category_page_mapper_chunk,
-    get_cooldowns,
-    get_perms,
+    get_command_metadata,
     pagify,
 )
 
@@ -35,7 +34,7 @@ class MinimalHelp(ThemesMeta):
         for cat in filtered_categories:
             if cat.cogs:
                 if not await get_category_page_mapper_chunk(
-                    self, get_pages, ctx, cat, help_settings, page_mapping
+                    self, ctx, cat, help_settings, page_mapping
                 ):
                     continue
                 # TODO getting categories twice, remove sometime!
@@ -76,7 +75,7 @@ class MinimalHelp(ThemesMeta):
         spacing = len(max(spacer_list, key=len))
         for cogname, data in coms:
             full_text += "\n".join(
-                f"`{name:<{spacing}}`:{command.format_shortdoc_for_context(ctx)}"
+                f"`{name:<{spacing}}`:{get_command_metadata(ctx, command).shortdoc}"
                 for name, command in data.items()
             )
             full_text += "\n"
@@ -100,7 +99,7 @@ class MinimalHelp(ThemesMeta):
 
         spacing = len(max(coms.keys(), key=len))
         full_text += "\n".join(
-            f"`{name:<{spacing}}:`{command.format_shortdoc_for_context(ctx)}"
+            f"`{name:<{spacing}}:`{get_command_metadata(ctx, command).shortdoc}"
             for name, command in sorted(coms.items())
         )
         pages = list(pagify(full_text))
@@ -120,9 +119,10 @@ class MinimalHelp(ThemesMeta):
             return
 
         command = obj
+        metadata = get_command_metadata(ctx, command)
 
         signature = _("`{ctx.clean_prefix}{command.qualified_name} {command.signature}`").format(
-            ctx=ctx, command=command
+            ctx=ctx, command=metadata
         )
         subcommands = None
 
@@ -141,10 +141,10 @@ class MinimalHelp(ThemesMeta):
         if aliases := get_aliases(command, ctx.invoked_with):
             full_text += "**Aliases:** " + ",".join(aliases) + "\n"
 
-        if cooldowns := get_cooldowns(command):
+        if cooldowns := metadata.cooldowns:
             full_text += "**Cooldowns:** " + "\n".join(cooldowns) + "\n"
 
-        if final_perms := get_perms(command):
+        if final_perms := metadata.perms:
             full_text += "**Permissions:**\n" + final_perms + "\n"
 
         if command_help:
@@ -155,7 +155,7 @@ class MinimalHelp(ThemesMeta):
         if subcommands:
             spacing = len(max(subcommands.keys(), key=len))
             subtext = "\n" + "\n".join(
-                f"`{name:<{spacing}}`:{command.format_shortdoc_for_context(ctx)}"
+                f"`{name:<{spacing}}`:{get_command_metadata(ctx, command).shortdoc}"
                 for name, command in sorted(subcommands.items())
             )
             for i, page in enumerate(pagify(subtext, shorten_by=0)):
@@ -10,8 +10,8 @@ from ..core.base_help import (
     chain,
     commands,
     get_category_page_mapper_chunk,
+    get_command_metadata,
     pagify,
-    shorten_line,
 )
 
 
@@ -21,14 +21,14 @@ class Mixture(ThemesMeta):
     async def format_bot_help(
         self, ctx: Context, help_settings: HelpSettings, get_pages: bool = False
     ):
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx, ctx.bot.description)
             filtered_categories = await self.filter_categories(ctx, GLOBAL_CATEGORIES)
             page_mapping = {}
             for cat in filtered_categories:
                 if cat.cogs:
                     if not await get_category_page_mapper_chunk(
-                        self, get_pages, ctx, cat, help_settings, page_mapping
+                        self, ctx, cat, help_settings, page_mapping
                     ):
                         continue
                     coms = await self.get_category_help_mapping(
@@ -59,7 +59,7 @@ class Mixture(ThemesMeta):
                     page_mapping=page_mapping,
                 )
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
 
     async def format_category_help(
         self,
@@ -74,7 +74,7 @@ class Mixture(ThemesMeta):
         )
         if not coms:
             return
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
             emb["thumbnail"] = obj.thumbnail
 
@@ -88,7 +88,7 @@ class Mixture(ThemesMeta):
                 title = f"**__{cog_name}:__**"
 
                 cog_text = "\n" + "\n".join(
-                    shorten_line(f"`{name:<{spacing}}:`{command.format_shortdoc_for_context(ctx)}")
+                    get_command_metadata(ctx, command).line(name, spacing)
                     for name, command in sorted(data.items())
                 )
                 for i, page in enumerate(pagify(cog_text, page_length=1000, shorten_by=0)):
@@ -102,14 +102,14 @@ class Mixture(ThemesMeta):
             else:
                 await self.send_pages(ctx, pages, embed=True, help_settings=help_settings)
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
 
     async def format_cog_help(self, ctx: Context, obj: commands.Cog, help_settings: HelpSettings):
         coms = await self.get_cog_help_mapping(ctx, obj, help_settings=help_settings)
         if not (coms or help_settings.verify_exists):
             return
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
 
             if description := obj.format_help_for_context(ctx):
@@ -117,7 +117,9 @@ class Mixture(ThemesMeta):
 
             for name, command in sorted(coms.items()):
                 emb["fields"].append(
-                    EmbedField(name, command.format_shortdoc_for_context(ctx) or "\N{ZWSP}", False)
+                    EmbedField(
+                        name, get_command_metadata(ctx, command).shortdoc or "\N{ZWSP}", False
+                    )
                 )
 
             pages = await self.make_embeds(ctx, emb, help_settings=help_settings)
@@ -128,4 +130,4 @@ class Mixture(ThemesMeta):
                 help_settings=help_settings,
             )
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
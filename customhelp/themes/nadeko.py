@@ -20,7 +20,7 @@ class NadekoHelp(ThemesMeta):
     async def format_bot_help(
         self, ctx: Context, help_settings: HelpSettings, get_pages: bool = False
     ):
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx, ctx.bot.description)
             filtered_categories = await self.filter_categories(ctx, GLOBAL_CATEGORIES)
             page_mapping = {}
@@ -28,7 +28,7 @@ class NadekoHelp(ThemesMeta):
             for cat in filtered_categories:
                 if cat.cogs:
                     if not await get_category_page_mapper_chunk(
-                        self, get_pages, ctx, cat, help_settings, page_mapping
+                        self, ctx, cat, help_settings, page_mapping
                     ):
                         continue
                     cat_titles += f"• {cat.name}\n"
@@ -52,7 +52,7 @@ class NadekoHelp(ThemesMeta):
                     page_mapping=page_mapping,
                 )
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
 
     async def format_category_help(
         self,
@@ -68,7 +68,7 @@ class NadekoHelp(ThemesMeta):
         if not coms:
             return
 
-        if await ctx.embed_requested():
+        if (await self.help_context(ctx)).embed_requested:
             emb = await self.embed_template(help_settings, ctx)
             emb["thumbnail"] = obj.thumbnail
             if description := obj.long_desc:
@@ -97,4 +97,4 @@ class NadekoHelp(ThemesMeta):
             else:
                 await self.send_pages(ctx, pages, embed=True, help_settings=help_settings)
         else:
-            await ctx.send(_("You need to enable embeds to use the help menu"))
+            await self.send_notice(ctx, _("You need to enable embeds to use the help menu"))
@@ -0,0 +1,80 @@
+"""chelp reorder, run against an in-memory category store
+
+Needs Red-DiscordBot installed."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("redbot")
+
+from customhelp.core import GLOBAL_CATEGORIES  # noqa: E402
+from customhelp.core.category import Category  # noqa: E402
+from customhelp.core.store import CategoryStore  # noqa: E402
+from customhelp.customhelp import CustomHelp  # noqa: E402
+
+
+class ConfigValue:
+    """Stand-in for config.categories"""
+
+    def __init__(self, data):
+        self.data = data
+
+    async def __call__(self):
+        return self.data
+
+    async def set(self, data):
+        self.data = data
+
+
+class Context:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content)
+
+
+def make_cog(categories):
+    cog = CustomHelp.__new__(CustomHelp)
+    cog.bot = SimpleNamespace(cogs={"General": None, "Fun": None, "Mod": None})
+    cog._formatter = None
+    cog.category_store = CategoryStore(
+        ConfigValue([category.to_dict() for category in categories]),
+        cog.apply_category_edit,
+        delay=0,
+    )
+    return cog
+
+
+def test_reorder_moves_the_given_categories_first():
+    async def run():
+        cog = make_cog(
+            [
+                Category(name="general", desc="", cogs=["General"]),
+                Category(name="fun", desc="", cogs=["Fun"]),
+                Category(name="uncategorised", desc="", cogs=[], is_uncat=True),
+            ]
+        )
+        await cog.refresh_cache()
+        ctx = Context()
+        await CustomHelp.reorder.callback(cog, ctx, categories="fun general")
+        await cog.category_store.flush()
+        return cog, ctx
+
+    cog, ctx = asyncio.run(run())
+
+    assert [category.name for category in GLOBAL_CATEGORIES] == [
+        "fun",
+        "general",
+        "uncategorised",
+    ]
+    assert [category["name"] for category in cog.category_store.value.data] == [
+        "fun",
+        "general",
+        "uncategorised",
+    ]
+    assert GLOBAL_CATEGORIES.category_of("Fun").name == "fun"
+    assert GLOBAL_CATEGORIES.category_of("Mod").is_uncat
+    assert ctx.sent[-1].startswith("Successfully reordered the categories")
@@ -0,0 +1,96 @@
+"""Randomized checks of the embed field packing in customhelp.core.base_help
+
+Seeded, so a failure always reproduces. Needs Red-DiscordBot installed."""
+
+import random
+
+import pytest
+
+pytest.importorskip("redbot")
+
+import discord  # noqa: E402
+
+from customhelp.core.base_help import (  # noqa: E402
+    EMBED_FIELD_LIMIT,
+    EMBED_TOTAL_LIMIT,
+    EmbedField,
+    EmbedPages,
+    embed_overhead,
+    pack_embed_fields,
+)
+
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+TITLE_LIMIT = 256
+DESCRIPTION_LIMIT = 4096
+AUTHOR_LIMIT = 256
+
+
+def random_text(rng: random.Random, low: int, high: int) -> str:
+    return "".join(rng.choice("ab c\n") for __ in range(rng.randint(low, high)))
+
+
+def random_embed(rng: random.Random):
+    fields = [
+        EmbedField(
+            random_text(rng, 1, FIELD_NAME_LIMIT),
+            random_text(rng, 1, FIELD_VALUE_LIMIT),
+            rng.random() < 0.5,
+        )
+        for __ in range(rng.randint(0, 150))
+    ]
+    embed_dict = {
+        "embed": {
+            "title": random_text(rng, 0, TITLE_LIMIT),
+            # leaves room for the "Page X of Y" header
+            "description": random_text(rng, 0, DESCRIPTION_LIMIT - 100),
+        },
+        "footer": {"text": random_text(rng, 0, 300)},
+        "fields": fields,
+    }
+    author_name = random_text(rng, 1, AUTHOR_LIMIT)
+    page_char_limit = rng.choice([250, 500, 1000, 2500, 5500, 10000])
+    return embed_dict, author_name, page_char_limit
+
+
+@pytest.mark.parametrize("seed", range(500))
+def test_pages_fit_discord_limits(seed):
+    rng = random.Random(seed)
+    embed_dict, author_name, page_char_limit = random_embed(rng)
+    fields = embed_dict["fields"]
+
+    groups = pack_embed_fields(
+        fields,
+        page_char_limit,
+        lambda page_count: embed_overhead(embed_dict, author_name, page_count),
+    )
+    # Checked on the embeds that get sent, so a wrong overhead can't agree with itself
+    pages = EmbedPages(
+        embed_dict,
+        groups,
+        discord.Color.red(),
+        {"name": author_name, "icon_url": "https://cdn.discordapp.com/embed/avatars/0.png"},
+        None,
+    )
+    embeds = [pages[index] for index in range(len(pages))]
+
+    for embed in embeds:
+        assert len(embed) <= EMBED_TOTAL_LIMIT
+        assert len(embed.fields) <= EMBED_FIELD_LIMIT
+        assert len(embed.title or "") <= TITLE_LIMIT
+        assert len(embed.description or "") <= DESCRIPTION_LIMIT
+        for field in embed.fields:
+            assert len(field.name) <= FIELD_NAME_LIMIT
+            assert len(field.value) <= FIELD_VALUE_LIMIT
+    # Nothing lost, duplicated or reordered
+    sent = [
+        EmbedField(field.name, field.value, field.inline)
+        for embed in embeds
+        for field in embed.fields
+    ]
+    assert sent == fields
+
+
+def test_no_fields_is_no_pages():
+    embed_dict = {"embed": {"title": "", "description": ""}, "footer": {"text": ""}}
+    assert pack_embed_fields([], 1000, lambda page_count: embed_overhead(embed_dict, "", 1)) == []